@@ -3,13 +3,45 @@
 Analyze eCOMMERCE_1.xlsx and generate keyword categorization summary
 """
 
-import pandas as pd
-import re
-from collections import Counter, defaultdict
+import argparse
+import sys
 from pathlib import Path
 
-def analyze_ecommerce_file():
-    """Analyze eCOMMERCE_1.xlsx file."""
+from excel_stream import ColumnStream, find_columns, split_columns
+from keyword_engine import (
+    DETAIL_COLUMNS, SUMMARY_COLUMNS, analyze_approx, analyze_columns, analyze_stream, analyze_text, load_taxonomy,
+    merge_analyses, text_columns, write_csv,
+)
+from instrumentation import Profile, log_to
+
+COLUMN_DETAIL_COLUMNS = ['Column'] + DETAIL_COLUMNS
+COLUMN_SUMMARY_COLUMNS = ['Column', 'Records', 'Unique Keywords', 'Total Occurrences'] + SUMMARY_COLUMNS
+
+
+def is_prerequisites_column(col):
+    return 'prerequisite' in col.lower() or 'pre' in col.lower()
+
+
+def analyze_ecommerce_file(stream=False, taxonomy_path=None, incremental=False, profile=False, approx=None,
+                           use_pandas=False, columns=None):
+    """Analyze eCOMMERCE_1.xlsx file.
+
+    By default the sheet is read once with openpyxl, keeping only the
+    Prerequisites column, so pandas is never imported; use_pandas=True loads
+    it into a DataFrame instead.
+    With stream=True the sheet is read in openpyxl read-only mode and only the
+    Prerequisites column is tokenized, row by row, so memory stays flat.
+    taxonomy_path selects a taxonomy file other than the default taxonomy.yaml.
+    With incremental=True only rows changed since the last run are tokenized
+    (see keyword_snapshot).
+    Stage timings are always recorded (see instrumentation); profile=True also
+    traces Python memory per stage and prints a profile table at the end.
+    With approx=N at most N keywords are tracked (SpaceSaving sketch); counts
+    become upper-bound estimates and their error bounds are printed.
+    columns lists several columns (comma-separated or a list; 'all' for every
+    text column) to analyze in one pass instead of the Prerequisites column;
+    see analyze_file_columns.
+    """
     
     file_path = Path("C:\\Users\\kritika.maheshwari\\Documents\\VSCode\\eCOMMERCE_1.xlsx")
     
@@ -22,110 +54,265 @@ def analyze_ecommerce_file():
     print("=" * 160)
     print()
     
-    # Read Excel file
-    excel_file = pd.ExcelFile(file_path)
-    sheet_name = excel_file.sheet_names[0]
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    taxonomy = load_taxonomy(taxonomy_path)
+    mode = 'incremental' if incremental else 'stream' if stream else 'pandas' if use_pandas else 'openpyxl'
+    if approx:
+        mode += '+approx'
+    if columns:
+        mode = 'columns+pandas' if use_pandas else 'columns'
+    with Profile('analyze_ecommerce_keywords', trace_memory=profile, file=file_path.name, mode=mode) as run:
+        if columns:
+            analyze_file_columns(file_path, columns, taxonomy, run, use_pandas)
+        else:
+            analyze_prerequisites(file_path, taxonomy, run, stream, incremental, approx, use_pandas)
+    if profile:
+        print_profile(run.finish())
+
+
+def analyze_prerequisites(file_path, taxonomy, run, stream=False, incremental=False, approx=None, use_pandas=False):
+    """Analyze the Prerequisites column of the first sheet (see analyze_ecommerce_file for the modes).
+
+    Returns the KeywordAnalysis, or None (with the error recorded on run) when there is no such column.
+    """
+    if stream:
+        # Stream the Prerequisites column only
+        with run.stage('excel_open'):
+            column_stream = ColumnStream(file_path, match=is_prerequisites_column)
+        sheet_name = column_stream.sheet_name
+        columns = column_stream.columns
+        prereq_col = column_stream.column
+        
+        print(f"📁 File: {file_path.name}")
+        print(f"📖 Sheet: {sheet_name}")
+        print(f"📐 Size: {len(columns)} columns (streaming mode)")
+        print(f"📋 Columns: {columns}")
+        print()
+        
+        if not prereq_col:
+            column_stream.close()
+            print(f"❌ Error: Prerequisites column not found!")
+            print(f"Available columns: {columns}")
+            run.finish(error="Prerequisites column not found")
+            return None
+        
+        values = column_stream
+    elif use_pandas:
+        import pandas as pd  # only on request; importing it costs more than analyzing a small file
+        
+        # Read Excel file
+        with run.stage('excel_load') as stage:
+            with pd.ExcelFile(file_path) as excel_file:
+                sheet_name = excel_file.sheet_names[0]
+                df = excel_file.parse(sheet_name)
+            stage.update(sheet_rows=df.shape[0], sheet_columns=df.shape[1])
+        
+        print(f"📁 File: {file_path.name}")
+        print(f"📖 Sheet: {sheet_name}")
+        print(f"📐 Size: {df.shape[0]} rows × {df.shape[1]} columns")
+        print(f"📋 Columns: {list(df.columns)}")
+        print()
+        
+        # Find Prerequisites column
+        prereq_col = None
+        for col in df.columns:
+            if is_prerequisites_column(col):
+                prereq_col = col
+                break
+        
+        if not prereq_col:
+            print(f"❌ Error: Prerequisites column not found!")
+            print(f"Available columns: {list(df.columns)}")
+            run.finish(error="Prerequisites column not found")
+            return None
+        
+        values = df[prereq_col].dropna()
+    else:
+        # Read the sheet once, keeping the Prerequisites column only
+        with run.stage('excel_load') as stage:
+            column_stream = ColumnStream(file_path, match=is_prerequisites_column)
+            values, rows = column_stream.load()
+            stage.update(sheet_rows=rows, sheet_columns=len(column_stream.columns))
+        sheet_name = column_stream.sheet_name
+        columns = column_stream.columns
+        prereq_col = column_stream.column
+        
+        print(f"📁 File: {file_path.name}")
+        print(f"📖 Sheet: {sheet_name}")
+        print(f"📐 Size: {rows} rows × {len(columns)} columns")
+        print(f"📋 Columns: {columns}")
+        print()
+        
+        if not prereq_col:
+            print(f"❌ Error: Prerequisites column not found!")
+            print(f"Available columns: {columns}")
+            run.finish(error="Prerequisites column not found")
+            return None
+    
+    # Extract and categorize keywords
+    if incremental:
+        from keyword_snapshot import analyze_incremental
+        
+        # Snapshot lives next to the CSV reports (current directory)
+        with run.stage('incremental') as stage:
+            result, changes = analyze_incremental(values, file_path, sheet_name, prereq_col, '.', taxonomy)
+            stage.update(rows=result.records, words=result.total_words, keywords=result.unique_keywords,
+                         tokenized=changes['tokenized'])
+    elif approx:
+        result = analyze_approx(values, prereq_col, approx, taxonomy, run)
+    elif use_pandas:
+        result = analyze_text(values, prereq_col, taxonomy, run)
+    else:
+        result = analyze_stream(values, prereq_col, taxonomy, run)
+    
+    print(f"✅ Found Prerequisites column: '{prereq_col}'")
+    print(f"📊 Total prerequisites: {result.records}")
+    if incremental:
+        print(f"♻️  Incremental: {changes['tokenized']} row(s) tokenized, "
+              f"{changes['added']} added, {changes['removed']} removed, {changes['unchanged']} unchanged")
+    if result.approximate:
+        print_error_bounds(result)
+    print()
+    print("=" * 160)
+    print()
+    
+    with run.stage('report'):
+        print_report(result)
+    with run.stage('csv_output'):
+        save_csv_reports(result)
+    print_statistics(result)
+    return result
+
+
+def analyze_file_columns(file_path, column_names, taxonomy, run, use_pandas=False):
+    """Analyze several columns of the first sheet in one read and report each and all combined.
+
+    column_names are matched case-insensitively; ['all'] selects every column
+    holding text. A comma-separated string is split once the header is known,
+    so a header containing commas can be named whole. The combined result goes
+    to the usual report and CSVs, the per-column results to a summary table
+    and *_by_column.csv files.
+    """
+    if use_pandas:
+        import pandas as pd
+        
+        with run.stage('excel_load') as stage:
+            with pd.ExcelFile(file_path) as excel_file:
+                sheet_name = excel_file.sheet_names[0]
+                df = excel_file.parse(sheet_name)
+            stage.update(sheet_rows=df.shape[0], sheet_columns=df.shape[1])
+        columns = [str(col) for col in df.columns]
+        df.columns = columns
+        column_names = _column_list(column_names, columns)
+        every = [name.lower() for name in column_names] == ['all']
+        if every:
+            found, missing = text_columns(df), []
+        else:
+            found, missing = find_columns(columns, column_names)
+    else:
+        column_stream = ColumnStream(file_path)
+        sheet_name = column_stream.sheet_name
+        columns = column_stream.columns
+        column_names = _column_list(column_names, columns)
+        every = [name.lower() for name in column_names] == ['all']
+        found, missing = (columns, []) if every else find_columns(columns, column_names)
     
     print(f"📁 File: {file_path.name}")
     print(f"📖 Sheet: {sheet_name}")
-    print(f"📐 Size: {df.shape[0]} rows × {df.shape[1]} columns")
-    print(f"📋 Columns: {list(df.columns)}")
+    print(f"📋 Columns: {columns}")
     print()
     
-    # Find Prerequisites column
-    prereq_col = None
-    for col in df.columns:
-        if 'prerequisite' in col.lower() or 'pre' in col.lower():
-            prereq_col = col
-            break
+    if missing or not found:
+        if not use_pandas:
+            column_stream.close()
+        print(f"❌ Error: Column(s) not found: {', '.join(missing) or 'no text columns'}")
+        print(f"Available columns: {columns}")
+        run.finish(error=f"column(s) not found: {', '.join(missing) or 'no text columns'}")
+        return None
     
-    if not prereq_col:
-        print(f"❌ Error: Prerequisites column not found!")
-        print(f"Available columns: {list(df.columns)}")
-        return
+    if use_pandas:
+        results = [analyze_text(df[col].dropna(), col, taxonomy, run) for col in found]
+        result = merge_analyses(results, ' + '.join(found), taxonomy)
+    else:
+        # One pass over the rows tokenizes every selected column
+        results, result = analyze_columns(column_stream.iter_columns(found), found, taxonomy, run, text_only=every)
     
-    prerequisites = df[prereq_col].dropna()
-    
-    print(f"✅ Found Prerequisites column: '{prereq_col}'")
-    print(f"📊 Total prerequisites: {len(prerequisites)}")
+    print(f"✅ Analyzed {len(results)} column(s) in one read:")
+    for column_result in results:
+        print(f"   • {column_result.column}: {column_result.records} records, "
+              f"{column_result.unique_keywords} unique keywords, {column_result.total_words} words")
     print()
     print("=" * 160)
     print()
     
-    # Extract keywords
-    common_words = {'the', 'and', 'or', 'a', 'an', 'in', 'is', 'has', 'with', 'for', 'to', 'of', 'at', 'by', 'from', 'on', 'that', 'this', 'as', 'be', 'are', 'was', 'were', 'been', 'being', 'have', 'should', 'must', 'can', 'will', 'may', 'could', 'would', 'it', 'its', 'if', 'exists', 'exist', 'under', 'also', 'only', 'not', 'just', 'some', 'more', 'no', 'up', 'out', 'so', 'do', 'does', 'did', 'then', 'there', 'here', 'each', 'all', 'which', 'when', 'what', 'where', 'who', 'why', 'how'}
-    
-    all_text = ' '.join([str(v) for v in prerequisites])
-    words = re.findall(r'\b[a-zA-Z_]+\b', all_text.lower())
-    word_freq = Counter([w for w in words if len(w) > 2 and w not in common_words])
-    
-    # Define categories
-    categories = {
-        'User/Account': ['user', 'account', 'email', 'pwd', 'login', 'email_addr', 'emailid', 'username', 'password'],
-        'Product/Catalog': ['product', 'cart', 'item', 'catalog', 'category', 'sku', 'inventory'],
-        'Order/Payment': ['order', 'checkout', 'payment', 'invoice', 'bill', 'transaction', 'purchase'],
-        'Shipping/Delivery': ['shipping', 'delivery', 'address', 'zip', 'postal', 'package', 'warehouse'],
-        'Status': ['status', 'processing', 'delivered', 'completed', 'pending', 'confirmed'],
-        'Refund/Return': ['refund', 'return', 'exchange', 'cancel', 'reverse'],
-        'Pricing/Discount': ['price', 'discount', 'coupon', 'promo', 'tax', 'fee'],
-        'Search/Filter': ['search', 'filter', 'sort', 'browse', 'find'],
-    }
-    
-    # Categorize keywords
-    categorized = defaultdict(lambda: {'keywords': [], 'counts': []})
-    uncategorized = []
-    
-    for word in word_freq.keys():
-        found = False
-        for category, keywords in categories.items():
-            if any(kw in word for kw in keywords):
-                categorized[category]['keywords'].append(word)
-                categorized[category]['counts'].append(word_freq[word])
-                found = True
-                break
-        if not found:
-            uncategorized.append((word, word_freq[word]))
+    with run.stage('report'):
+        print_report(result)
+        print_column_summaries(results)
+    with run.stage('csv_output'):
+        save_csv_reports(result)
+        save_column_csv_reports(results)
+    print_statistics(result)
+    return results, result
+
+
+def _column_list(column_names, columns):
+    return split_columns(column_names, columns) if isinstance(column_names, str) else column_names
+
+
+def print_column_summaries(results):
+    """Print the category summary of each column (percentages of that column's words)."""
+    print("PER-COLUMN CATEGORY SUMMARY")
+    print("-" * 160)
+    print(f"{'Column':<30} | {'Category':<25} | {'Keywords':>10} | {'Total Count':>15} | {'% of Column':>12}")
+    print("-" * 160)
     
-    if uncategorized:
-        categorized['Other'] = {
-            'keywords': [w[0] for w in uncategorized],
-            'counts': [w[1] for w in uncategorized]
-        }
+    for result in results:
+        for i, row in enumerate(result.summary_rows()):
+            column = result.column if i == 0 else ''
+            print(f"{column:<30} | {row['Category']:<25} | {row['Keywords']:>10} | {row['Total Count']:>15} | "
+                  f"{row['Percentage']:>12}")
+        print("-" * 160)
+    print()
+
+
+def save_column_csv_reports(results, detail_csv='ecommerce_keyword_detailed_by_column.csv',
+                            summary_csv='ecommerce_keyword_summary_by_column.csv'):
+    """Save the detailed and summary tables of every column, with a leading Column field."""
+    write_csv(detail_csv, [{'Column': r.column, **row} for r in results for row in r.detail_rows()],
+              COLUMN_DETAIL_COLUMNS)
+    print(f"✅ Per-column categorization saved to: {detail_csv}")
     
-    # Print detailed table
+    summary_rows = [
+        {'Column': r.column, 'Records': r.records, 'Unique Keywords': r.unique_keywords,
+         'Total Occurrences': r.total_words, **row}
+        for r in results for row in r.summary_rows()
+    ]
+    write_csv(summary_csv, summary_rows, COLUMN_SUMMARY_COLUMNS)
+    print(f"✅ Per-column summary saved to: {summary_csv}")
+    print()
+    print("=" * 160)
+    print()
+
+
+def print_report(result):
+    """Print the detailed keyword table and the category summary table."""
     print("DETAILED KEYWORD CATEGORIZATION TABLE")
     print("-" * 160)
     print(f"{'Category':<25} | {'Keyword':<30} | {'Count':>8} | {'Percentage':>12} | {'% of Category':>15}")
     print("-" * 160)
     
-    for category in sorted(categorized.keys()):
-        if category == 'Other':
-            continue
-        keywords_list = categorized[category]['keywords']
-        counts_list = categorized[category]['counts']
-        category_total = sum(counts_list)
-        
-        for i, (keyword, count) in enumerate(sorted(zip(keywords_list, counts_list), key=lambda x: x[1], reverse=True)):
-            percentage = f"{(count/len(words)*100):.1f}%"
-            cat_percentage = f"{(count/category_total*100):.1f}%"
-            if i == 0:
-                print(f"{category:<25} | {keyword:<30} | {count:>8} | {percentage:>12} | {cat_percentage:>15}")
-            else:
-                print(f"{'':25} | {keyword:<30} | {count:>8} | {percentage:>12} | {cat_percentage:>15}")
-        print("-" * 160)
+    # 'Other' is printed last
+    categories = [c for c in result.categories() if c != 'Other']
+    if 'Other' in result.categorized:
+        categories.append('Other')
     
-    # Print Other category
-    if 'Other' in categorized:
-        keywords_list = categorized['Other']['keywords']
-        counts_list = categorized['Other']['counts']
-        category_total = sum(counts_list)
+    for category in categories:
+        category_total = result.category_total(category)
         
-        for i, (keyword, count) in enumerate(sorted(zip(keywords_list, counts_list), key=lambda x: x[1], reverse=True)):
-            percentage = f"{(count/len(words)*100):.1f}%"
-            cat_percentage = f"{(count/category_total*100):.1f}%"
+        for i, (keyword, count) in enumerate(result.category_keywords(category)):
+            percentage = result.percentage(count)
+            cat_percentage = result.percentage(count, category_total)
             if i == 0:
-                print(f"{'Other':<25} | {keyword:<30} | {count:>8} | {percentage:>12} | {cat_percentage:>15}")
+                print(f"{category:<25} | {keyword:<30} | {count:>8} | {percentage:>12} | {cat_percentage:>15}")
             else:
                 print(f"{'':25} | {keyword:<30} | {count:>8} | {percentage:>12} | {cat_percentage:>15}")
         print("-" * 160)
@@ -140,66 +327,103 @@ def analyze_ecommerce_file():
     print(f"{'Category':<25} | {'Keywords':>10} | {'Total Count':>15} | {'% of Total':>12}")
     print("-" * 160)
     
-    summary_data = []
-    for category in sorted(categorized.keys()):
-        num_keywords = len(categorized[category]['keywords'])
-        total_count = sum(categorized[category]['counts'])
-        percentage = f"{(total_count/len(words)*100):.1f}%"
-        
-        print(f"{category:<25} | {num_keywords:>10} | {total_count:>15} | {percentage:>12}")
-        summary_data.append({
-            'Category': category,
-            'Keywords': num_keywords,
-            'Total Count': total_count,
-            'Percentage': percentage
-        })
+    for row in result.summary_rows():
+        print(f"{row['Category']:<25} | {row['Keywords']:>10} | {row['Total Count']:>15} | {row['Percentage']:>12}")
     
     print("-" * 160)
     print()
-    
-    # Save to CSV files
+
+
+def save_csv_reports(result, detail_csv='ecommerce_keyword_detailed.csv', summary_csv='ecommerce_keyword_summary.csv'):
+    """Save the detailed categorization and the category summary as CSV."""
     print("=" * 160)
     print()
     
-    # Save detailed categorization
-    detail_data = []
-    for category in sorted(categorized.keys()):
-        for keyword, count in zip(categorized[category]['keywords'], categorized[category]['counts']):
-            detail_data.append({
-                'Category': category,
-                'Keyword': keyword,
-                'Count': count,
-                'Percentage': f"{(count/len(words)*100):.1f}%"
-            })
-    
-    detail_df = pd.DataFrame(detail_data)
-    detail_df = detail_df.sort_values(['Category', 'Count'], ascending=[True, False])
-    
-    detail_csv = 'ecommerce_keyword_detailed.csv'
-    detail_df.to_csv(detail_csv, index=False)
+    write_csv(detail_csv, result.detail_rows(), DETAIL_COLUMNS)
     print(f"✅ Detailed categorization saved to: {detail_csv}")
     
-    # Save summary
-    summary_df = pd.DataFrame(summary_data)
-    summary_csv = 'ecommerce_keyword_summary.csv'
-    summary_df.to_csv(summary_csv, index=False)
+    write_csv(summary_csv, result.summary_rows(), SUMMARY_COLUMNS)
     print(f"✅ Category summary saved to: {summary_csv}")
     
     print()
     print("=" * 160)
     print()
-    
-    # Statistics
+
+
+def print_error_bounds(result):
+    """Print what an approximate (SpaceSaving) result guarantees."""
+    sketch = result.sketch
+    guaranteed = sum(1 for word in sketch.counts if sketch.guaranteed(word))
+    max_error = max(sketch.errors.values(), default=0)
+    print(f"≈  Approximate: {len(sketch.counts)} of at most {sketch.capacity} keywords tracked")
+    print(f"≈  Counts overestimate by at most {max_error}; untracked keywords occurred at most {sketch.floor} times")
+    print(f"≈  {guaranteed} keyword(s) certainly belong to the true top {len(sketch.counts)}")
+    for category in result.categories():
+        error = result.category_error(category)
+        if error:
+            print(f"≈  {category}: total {result.category_total(category)} overcounts by at most {error}")
+
+
+def print_statistics(result):
     print("STATISTICS")
     print("-" * 160)
-    print(f"Total unique keywords: {len(word_freq)}")
-    print(f"Total keyword occurrences: {len(words)}")
-    print(f"Total categories: {len(categorized)}")
-    print(f"Average keywords per category: {len(word_freq) / len(categorized):.1f}")
-    print(f"Average occurrences per keyword: {len(words) / len(word_freq):.1f}")
+    print(f"Total unique keywords: {result.unique_keywords}")
+    print(f"Total keyword occurrences: {result.total_words}")
+    print(f"Total categories: {len(result.categorized)}")
+    if result.categorized:
+        print(f"Average keywords per category: {result.unique_keywords / len(result.categorized):.1f}")
+        print(f"Average occurrences per keyword: {result.total_words / result.unique_keywords:.1f}")
+    print()
+    print("=" * 160)
+
+
+def print_profile(summary):
+    """Print the per-stage timing and memory table of a finished run."""
+    print()
+    print("PROFILE")
+    print("-" * 160)
+    print(f"{'Stage':<20} | {'Wall (s)':>10} | {'CPU (s)':>10} | {'Peak traced (MB)':>17} | {'Max RSS (MB)':>13} | Counts")
+    print("-" * 160)
+    for stage in summary['stages']:
+        counts = ', '.join(f"{k}={v}" for k, v in stage.items()
+                           if k not in ('stage', 'wall_s', 'cpu_s', 'peak_traced_mb', 'max_rss_mb'))
+        print(f"{stage['stage']:<20} | {stage['wall_s']:>10.3f} | {stage['cpu_s']:>10.3f} | "
+              f"{str(stage.get('peak_traced_mb', '-')):>17} | {str(stage['max_rss_mb'] or '-'):>13} | {counts}")
+    print("-" * 160)
+    print(f"{'Total':<20} | {summary['wall_s']:>10.3f} | {summary['cpu_s']:>10.3f}")
+    if summary.get('error'):
+        print(f"❌ Run failed: {summary['error']}")
     print()
     print("=" * 160)
 
 
 if __name__ == "__main__":
-    analyze_ecommerce_file()
+    parser = argparse.ArgumentParser(description="Keyword categorization for eCOMMERCE_1.xlsx")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream the Prerequisites column in read-only mode (flat memory for very large sheets)")
+    parser.add_argument("--taxonomy", metavar="PATH",
+                        help="taxonomy file (YAML/JSON) with stop_words and categories; default taxonomy.yaml")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse the per-row snapshot from the last run; only changed rows are tokenized")
+    parser.add_argument("--profile", action="store_true",
+                        help="trace memory per stage, print a profile table and write JSON log lines to stderr")
+    parser.add_argument("--approx", type=int, metavar="N",
+                        help="track at most N keywords (bounded memory, approximate counts with error bounds)")
+    parser.add_argument("--columns", metavar="A,B,...",
+                        help="analyze these columns (or 'all' text columns) in one pass, per column and combined")
+    parser.add_argument("--pandas", action="store_true",
+                        help="load the sheet with pandas instead of openpyxl (slower start-up)")
+    args = parser.parse_args()
+    if args.approx is not None and args.approx < 1:
+        parser.error("--approx must be at least 1")
+    if args.approx and args.incremental:
+        parser.error("--approx cannot be combined with --incremental")
+    # Split once the header is known (see analyze_file_columns)
+    columns = (args.columns or "").strip()
+    if columns and (args.incremental or args.approx):
+        parser.error("--columns cannot be combined with --incremental or --approx")
+    if args.profile:
+        log_to(sys.stderr)
+    analyze_ecommerce_file(stream=args.stream, taxonomy_path=args.taxonomy, incremental=args.incremental,
+                           profile=args.profile, approx=args.approx, use_pandas=args.pandas,
+                           columns=columns)
@@ -1,23 +1,186 @@
-import asyncio, os
+import argparse, asyncio, hashlib, json, os, time
+from contextlib import AsyncExitStack
+from datetime import datetime
 from dotenv import load_dotenv
 from air import DistillerClient
+from query_cache import open_cache
+from stream_metrics import StreamMetrics
 
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
 
 PROJECT = "weather_project"   # letters/numbers/hyphens/underscores only
 USER_ID = "test_user"         # same naming rule
+CONFIG_PATH = "configWeather.yaml"
 
-async def main():
-    # 1) Create/register the project once (uploads your YAML)
+# Local record of the config hash last registered per project
+REGISTRY_PATH = os.getenv("DISTILLER_REGISTRY", ".distiller_registry.json")
+
+def config_hash(config_path):
+    with open(config_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def register_project(client, config_path=CONFIG_PATH, project=PROJECT, force=False):
+    """Create/register the project unless this config was already registered. Returns True if uploaded."""
+    digest = config_hash(config_path)
+    # Registrations belong to an account, so a different API key registers again
+    account = hashlib.sha256((API_KEY or "").encode()).hexdigest()[:16]
+    try:
+        with open(REGISTRY_PATH, encoding="utf-8") as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        registry = {}
+
+    entry = registry.get(project, {})
+    if not force and entry.get("config_sha256") == digest and entry.get("account") == account:
+        return False
+
+    client.create_project(config_path=config_path, project=project)
+    registry[project] = {
+        "config_sha256": digest,
+        "account": account,
+        "registered_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    tmp = f"{REGISTRY_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp, REGISTRY_PATH)
+    return True
+
+def _session(client, uuid, metrics=None):
+    """Session context for uuid; metrics times opening it."""
+    context = client(project=PROJECT, uuid=uuid)
+    return metrics.session(context) if metrics is not None else context
+
+def _wrap(dc, cache=None, metrics=None):
+    """Session with metrics inside the cache, so only queries sent to Distiller are timed, not cache hits."""
+    if metrics is not None:
+        dc = metrics.wrap(dc)
+    if cache is not None:
+        dc = cache.wrap(dc)
+    return dc
+
+async def main(force_register=False, cache=None, metrics=None):
+    # 1) Create/register the project (uploads your YAML only when it changed)
     client = DistillerClient(api_key=API_KEY)
-    client.create_project(config_path="configWeather.yaml", project=PROJECT)
+    if not register_project(client, force=force_register):
+        print(f"Project '{PROJECT}' already registered with this {CONFIG_PATH}; skipping upload")
 
     # 2) Connect and query
-    async with client(project=PROJECT, uuid=USER_ID) as dc:
+    async with _session(client, USER_ID, metrics=metrics) as dc:
+        dc = _wrap(dc, cache, metrics)
         responses = await dc.query(query="What is time in India")
         async for r in responses:
             print("Response:", r["content"])
 
+class QueryFileError(ValueError):
+    """A line of a batch query file that cannot be run."""
+
+def read_queries(input_path, field="query"):
+    """Yield (id, query) from a JSONL file; id defaults to "id"/"request_id" or the line number.
+
+    Raises QueryFileError naming the line when it is not a JSON object or lacks field.
+    """
+    with open(input_path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                raise QueryFileError(f"{input_path}, line {line_no}: invalid JSON ({e})") from None
+            if not isinstance(item, dict) or field not in item:
+                raise QueryFileError(f"{input_path}, line {line_no}: no '{field}' field "
+                                     f"(use --field to choose the field holding the query)")
+            yield item.get("id", item.get("request_id", line_no)), item[field]
+
+async def run_query(dc, query_id, query):
+    """Run one query and return its output record with status and latency."""
+    start = time.perf_counter()
+    record = {"id": query_id, "query": query}
+    try:
+        chunks = []
+        responses = await dc.query(query=query)
+        async for r in responses:
+            if not chunks:
+                record["first_chunk_s"] = round(time.perf_counter() - start, 3)
+            chunks.append(r["content"])
+        record.update(status="ok", responses=chunks)
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["latency_s"] = round(time.perf_counter() - start, 3)
+    return record
+
+async def run_batch(input_path, output_path, concurrency=4, sessions=1, field="query", force_register=False,
+                    cache=None, metrics=None):
+    """Run every query of input_path with up to concurrency in flight over a pool of sessions.
+
+    Queries share the sessions round-robin so their round-trips overlap; output
+    records are appended to output_path as queries complete. Returns (succeeded, failed).
+    """
+    queries = list(read_queries(input_path, field))
+    client = DistillerClient(api_key=API_KEY)
+    if not register_project(client, force=force_register):
+        print(f"Project '{PROJECT}' already registered with this {CONFIG_PATH}; skipping upload")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    pool = []
+    counts = {"ok": 0, "error": 0}
+    start = time.perf_counter()
+
+    async with AsyncExitStack() as stack:
+        for i in range(max(1, min(sessions, len(queries)))):
+            # The first session is the interactive path's USER_ID conversation; extra ones get a suffix
+            uuid = USER_ID if i == 0 else f"{USER_ID}-{i}"
+            dc = await stack.enter_async_context(_session(client, uuid, metrics=metrics))
+            pool.append(_wrap(dc, cache, metrics))
+
+        with open(output_path, "w", encoding="utf-8") as out:
+            async def worker(i, query_id, query):
+                async with semaphore:
+                    record = await run_query(pool[i % len(pool)], query_id, query)
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                counts[record["status"]] += 1
+                print(f"{record['status']:>5}  {record['latency_s']:7.2f}s  {query_id}")
+
+            await asyncio.gather(*(worker(i, query_id, query) for i, (query_id, query) in enumerate(queries)))
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(queries)} queries in {elapsed:.1f}s ({counts['ok']} ok, {counts['error']} failed) -> {output_path}")
+    if cache is not None:
+        print(f"Response cache: {cache.hits} hits, {cache.misses} misses")
+    return counts["ok"], counts["error"]
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Query the weather/time Distiller project")
+    parser.add_argument("--force-register", action="store_true",
+                        help=f"upload {CONFIG_PATH} even if it is unchanged since the last registration")
+    parser.add_argument("--batch", metavar="JSONL", help="run the queries of a JSONL file instead of the sample query")
+    parser.add_argument("--field", default="query", help="JSON field holding the query text (default: query)")
+    parser.add_argument("-o", "--output", default="responses.jsonl", help="output JSONL for --batch")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="queries in flight at once (default: 4)")
+    parser.add_argument("--sessions", type=int, default=1,
+                        help="sessions to open and share round-robin (default: 1)")
+    parser.add_argument("--cache", choices=["off", "memory", "sqlite"], default="off",
+                        help="answer repeated queries from a TTL response cache (default: off)")
+    parser.add_argument("--cache-path", default=".query_cache.sqlite", help="SQLite file for --cache sqlite")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="write connect, first-chunk, chunk-gap and total latencies to PATH at exit")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"], default="json",
+                        help="format for --metrics (default: json)")
+    args = parser.parse_args()
+    cache = open_cache(args.cache, PROJECT, CONFIG_PATH, args.cache_path)
+    metrics = StreamMetrics() if args.metrics else None
+    try:
+        if args.batch:
+            try:
+                ok, failed = asyncio.run(run_batch(args.batch, args.output, args.concurrency, args.sessions,
+                                                   args.field, args.force_register, cache, metrics))
+            except QueryFileError as e:
+                parser.error(str(e))
+            raise SystemExit(1 if failed else 0)
+        asyncio.run(main(force_register=args.force_register, cache=cache, metrics=metrics))
+    finally:
+        if metrics is not None:
+            metrics.dump(args.metrics, args.metrics_format)
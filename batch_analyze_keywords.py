@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Headless batch keyword analysis over many workbooks and sheets
+
+Usage:
+    python batch_analyze_keywords.py "testcases/**/*.xlsx" -o reports/nightly --workers 8
+    python batch_analyze_keywords.py data/ --sheets Sheet1,Regression --column Description
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from analyze_ecommerce_keywords import is_prerequisites_column
+from excel_stream import ColumnStream, find_column, open_workbook
+from keyword_engine import (
+    DETAIL_COLUMNS, SUMMARY_COLUMNS, analyze_approx, analyze_stream, analyze_text, load_taxonomy, merge_analyses,
+    write_csv,
+)
+from keyword_snapshot import analyze_incremental
+
+EXCEL_SUFFIXES = {'.xlsx', '.xlsm'}
+
+PER_FILE_DETAIL_COLUMNS = ['File', 'Sheet', 'Column'] + DETAIL_COLUMNS
+PER_FILE_SUMMARY_COLUMNS = ['File', 'Sheet', 'Column', 'Records', 'Unique Keywords', 'Total Occurrences'] + SUMMARY_COLUMNS
+
+
+def expand_inputs(inputs):
+    """Resolve files, directories (searched recursively) and glob patterns to workbook paths."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = (str(p) for p in Path(item).rglob('*'))
+        elif glob.has_magic(item):
+            candidates = glob.iglob(item, recursive=True)
+        else:
+            candidates = [item]
+        for candidate in candidates:
+            path = Path(candidate)
+            # Skip Excel lock files (~$Book1.xlsx)
+            if path.suffix.lower() in EXCEL_SUFFIXES and not path.name.startswith('~$') and path.is_file():
+                paths.append(str(path.resolve()))
+    return sorted(set(paths))
+
+
+def _column_for(columns, column_name):
+    if column_name:
+        return find_column(columns, column_name)
+    return next((col for col in columns if is_prerequisites_column(col)), None)
+
+
+def _describe_changes(changes):
+    return f"{changes['tokenized']} row(s) tokenized, {changes['added']} added, {changes['removed']} removed"
+
+
+def analyze_workbook(file_path, sheets=None, column_name=None, taxonomy_path=None, stream=False, snapshot_dir=None,
+                     approx=None):
+    """Analyze the selected sheets (default: all) of one workbook.
+
+    Runs inside a worker process. With snapshot_dir set, each sheet is analyzed
+    incrementally against its snapshot there; with approx=N at most N keywords
+    are tracked per sheet. Returns a list of (sheet, result or None, message).
+    """
+    taxonomy = load_taxonomy(taxonomy_path)
+    outcomes = []
+
+    if stream:
+        # One read-only workbook serves every sheet
+        workbook = open_workbook(file_path)
+        try:
+            for sheet in sheets or workbook.sheetnames:
+                if sheet not in workbook.sheetnames:
+                    outcomes.append((sheet, None, "sheet not found"))
+                    continue
+                if column_name:
+                    column_stream = ColumnStream(file_path, column_name=column_name, sheet_name=sheet,
+                                                 workbook=workbook)
+                else:
+                    column_stream = ColumnStream(file_path, sheet_name=sheet, match=is_prerequisites_column,
+                                                 workbook=workbook)
+                if not column_stream.column:
+                    outcomes.append((sheet, None, "column not found"))
+                    continue
+                if snapshot_dir:
+                    result, changes = analyze_incremental(
+                        column_stream, file_path, sheet, column_stream.column, snapshot_dir, taxonomy
+                    )
+                    outcomes.append((sheet, result, _describe_changes(changes)))
+                elif approx:
+                    outcomes.append((sheet, analyze_approx(column_stream, column_stream.column, approx, taxonomy),
+                                     "ok"))
+                else:
+                    outcomes.append((sheet, analyze_stream(column_stream, column_stream.column, taxonomy), "ok"))
+        finally:
+            workbook.close()
+        return outcomes
+
+    with pd.ExcelFile(file_path) as excel_file:
+        for sheet in sheets or excel_file.sheet_names:
+            if sheet not in excel_file.sheet_names:
+                outcomes.append((sheet, None, "sheet not found"))
+                continue
+            df = excel_file.parse(sheet)
+            columns = {str(col): col for col in df.columns}
+            target_col = _column_for(list(columns), column_name)
+            if not target_col:
+                outcomes.append((sheet, None, "column not found"))
+                continue
+            text_data = df[columns[target_col]].dropna()
+            if snapshot_dir:
+                result, changes = analyze_incremental(text_data, file_path, sheet, target_col, snapshot_dir, taxonomy)
+                outcomes.append((sheet, result, _describe_changes(changes)))
+            elif approx:
+                outcomes.append((sheet, analyze_approx(text_data, target_col, approx, taxonomy), "ok"))
+            else:
+                outcomes.append((sheet, analyze_text(text_data, target_col, taxonomy), "ok"))
+    return outcomes
+
+
+def run_batch(paths, output_dir='.', sheets=None, column_name=None, taxonomy_path=None, stream=False, workers=None,
+              incremental=False, approx=None):
+    """Analyze workbooks in a process pool and write combined and per-file CSVs to output_dir.
+
+    With incremental=True per-sheet snapshots are kept in output_dir and only
+    changed rows are re-tokenized. With approx=N each sheet and the combined
+    result track at most N keywords.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    taxonomy = load_taxonomy(taxonomy_path)
+
+    per_sheet = []
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(analyze_workbook, path, sheets, column_name, taxonomy_path, stream,
+                        str(output_dir) if incremental else None, approx): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                outcomes = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {path}: {e}")
+                continue
+            for sheet, result, message in outcomes:
+                if result is None:
+                    print(f"⚠️  {Path(path).name} [{sheet}]: skipped ({message})")
+                else:
+                    note = "" if message == "ok" else f" ({message})"
+                    print(f"✅ {Path(path).name} [{sheet}]: {result.records} records, {result.unique_keywords} keywords{note}")
+                    per_sheet.append((path, sheet, result))
+
+    # Deterministic output order regardless of completion order
+    per_sheet.sort(key=lambda item: (item[0], item[1]))
+
+    combined = merge_analyses([result for _, _, result in per_sheet], column_name or 'Prerequisites', taxonomy)
+    write_csv(output_dir / 'ecommerce_keyword_detailed.csv', combined.detail_rows(), DETAIL_COLUMNS)
+    write_csv(output_dir / 'ecommerce_keyword_summary.csv', combined.summary_rows(), SUMMARY_COLUMNS)
+
+    detail_rows = []
+    summary_rows = []
+    for path, sheet, result in per_sheet:
+        prefix = {'File': path, 'Sheet': sheet, 'Column': result.column}
+        detail_rows.extend({**prefix, **row} for row in result.detail_rows())
+        stats = {'Records': result.records, 'Unique Keywords': result.unique_keywords,
+                 'Total Occurrences': result.total_words}
+        summary_rows.extend({**prefix, **stats, **row} for row in result.summary_rows())
+    write_csv(output_dir / 'per_file_keyword_detailed.csv', detail_rows, PER_FILE_DETAIL_COLUMNS)
+    write_csv(output_dir / 'per_file_keyword_summary.csv', summary_rows, PER_FILE_SUMMARY_COLUMNS)
+
+    return combined, per_sheet, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch keyword categorization over many workbooks")
+    parser.add_argument("inputs", nargs="+", help="workbook files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the CSV reports (default: current)")
+    parser.add_argument("--sheets", help="comma-separated sheet names to analyze (default: all sheets)")
+    parser.add_argument("--column", help="column to analyze, case-insensitive (default: the Prerequisites column)")
+    parser.add_argument("--taxonomy", metavar="PATH", help="taxonomy file (default taxonomy.yaml)")
+    parser.add_argument("--stream", action="store_true", help="stream the column in read-only mode")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep per-sheet snapshots in the output directory and only re-tokenize changed rows")
+    parser.add_argument("--approx", type=int, metavar="N",
+                        help="track at most N keywords per sheet and combined (approximate counts)")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+    if args.approx is not None and args.approx < 1:
+        parser.error("--approx must be at least 1")
+    if args.approx and args.incremental:
+        parser.error("--approx cannot be combined with --incremental")
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("❌ Error: No Excel workbooks matched the given inputs")
+        return 1
+
+    sheets = [s.strip() for s in args.sheets.split(',')] if args.sheets else None
+
+    print("=" * 80)
+    print(f"BATCH KEYWORD ANALYSIS - {len(paths)} workbook(s)")
+    print("=" * 80)
+    start = time.perf_counter()
+
+    combined, per_sheet, failures = run_batch(
+        paths, args.output_dir, sheets, args.column, args.taxonomy, args.stream, args.workers, args.incremental,
+        args.approx
+    )
+
+    print()
+    print(f"📊 Sheets analyzed: {len(per_sheet)}")
+    print(f"📊 Records: {combined.records}")
+    print(f"📊 Unique keywords: {combined.unique_keywords}")
+    print(f"📊 Keyword occurrences: {combined.total_words}")
+    if combined.approximate:
+        print(f"≈  Approximate: counts overestimate by at most {max(combined.sketch.errors.values(), default=0)}; "
+              f"untracked keywords occurred at most {combined.sketch.floor} times")
+    print(f"⏱️  Elapsed: {time.perf_counter() - start:.1f}s")
+    print(f"✅ Reports written to: {Path(args.output_dir).resolve()}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the keyword analysis pipeline
+
+Generates synthetic eCommerce test-case workbooks and times each stage of the
+CLI (analyze_ecommerce_file) and web UI (analyze_keywords) paths separately.
+Results are written to JSON so runs can be compared.
+
+Usage:
+    python benchmark_keywords.py --rows 1000,10000,100000 -o benchmark_results.json
+    python benchmark_keywords.py --rows 100000 --columns 12 --words 40 --compare benchmark_results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+
+from excel_stream import ColumnStream
+from keyword_engine import (
+    DETAIL_COLUMNS, ENGINE_VERSION, SUMMARY_COLUMNS, KeywordAnalysis, categorize_keywords, count_keywords,
+    count_keywords_stream, load_taxonomy, write_csv,
+)
+from workbook_cache import WorkbookCache
+
+BASE_COLUMNS = ['Test Case ID', 'Prerequisites', 'Description', 'Steps', 'Priority']
+FILLER_WORDS = [
+    'verify', 'page', 'button', 'displayed', 'valid', 'invalid', 'message', 'enter', 'click', 'screen',
+    'logged', 'contains', 'selected', 'field', 'form', 'error', 'success', 'open', 'navigate', 'guest',
+]
+SUFFIXES = ['', '', '', 's', 'ed', 'ing', '_id', '_page']
+
+
+def build_vocabulary(taxonomy, unique_words=500, seed=0):
+    """Words for synthetic cells: category terms and variants, filler, stop words and random tokens."""
+    rng = random.Random(seed)
+    terms = [term for terms in taxonomy.categories.values() for term in terms]
+    vocabulary = [term + suffix for term in terms for suffix in SUFFIXES]
+    vocabulary += FILLER_WORDS * 3 + sorted(taxonomy.stop_words) * 2
+    vocabulary += [
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(unique_words)
+    ]
+    return vocabulary
+
+
+def _sentence(rng, vocabulary, words):
+    return ' '.join(rng.choices(vocabulary, k=max(1, int(rng.gauss(words, words / 4))))).capitalize() + '.'
+
+
+def generate_workbook(path, rows, columns=5, words=12, unique_words=500, seed=0, taxonomy=None):
+    """Write a synthetic test-case workbook with rows rows and columns columns (at least 5).
+
+    Text cells hold about words words drawn from the taxonomy vocabulary;
+    about 5% of text cells are left empty.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(taxonomy, unique_words, seed)
+    header = BASE_COLUMNS + [f'Field {i}' for i in range(1, max(columns, len(BASE_COLUMNS)) - len(BASE_COLUMNS) + 1)]
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Test Cases')
+    sheet.append(header)
+    for i in range(1, rows + 1):
+        row = [f'TC_{i:07d}']
+        for _ in header[1:4]:
+            row.append(_sentence(rng, vocabulary, words) if rng.random() > 0.05 else None)
+        row.append(rng.choice(['High', 'Medium', 'Low']))
+        for _ in header[5:]:
+            row.append(_sentence(rng, vocabulary, max(words // 4, 1)))
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+class StageTimer:
+    """Collects wall-clock durations per stage name."""
+
+    def __init__(self):
+        self.durations = {}
+
+    def time(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        value = fn(*args, **kwargs)
+        self.durations.setdefault(stage, []).append(time.perf_counter() - start)
+        return value
+
+    def summary(self):
+        return {
+            stage: {
+                'min': round(min(values), 6),
+                'median': round(statistics.median(values), 6),
+                'mean': round(statistics.mean(values), 6),
+                'runs': len(values),
+            }
+            for stage, values in self.durations.items()
+        }
+
+
+def run_stages(path, column, output_dir, timer, taxonomy, render_html=None):
+    """Time one pass over each stage of the CLI and UI analysis paths."""
+    # CLI path (analyze_ecommerce_file): one openpyxl pass keeping the column, then analysis and CSV output
+    values, _ = timer.time('cli.excel_load', lambda: ColumnStream(path, column_name=column).load())
+    word_freq, total_words, records = timer.time('cli.tokenize', count_keywords_stream, values, taxonomy.stop_words)
+    # Time categorization from scratch, not from the matcher's memo of earlier passes
+    taxonomy.matcher.match.cache_clear()
+    categorized = timer.time('cli.categorize', categorize_keywords, word_freq, taxonomy.matcher)
+    result = KeywordAnalysis(column, records, total_words, word_freq, categorized, taxonomy.name)
+    timer.time('cli.csv_output', lambda: (
+        write_csv(output_dir / 'ecommerce_keyword_detailed.csv', result.detail_rows(), DETAIL_COLUMNS),
+        write_csv(output_dir / 'ecommerce_keyword_summary.csv', result.summary_rows(), SUMMARY_COLUMNS),
+    ))
+
+    # CLI --pandas path: whole-sheet DataFrame load (tokenizing a Series is timed as ui.tokenize)
+    timer.time('cli.pandas_excel_load', pd.read_excel, path)
+
+    # CLI --stream path: load and tokenize happen together
+    timer.time('cli.stream_load_tokenize', lambda: count_keywords_stream(
+        ColumnStream(path, column_name=column), taxonomy.stop_words
+    ))
+
+    # UI path (analyze_keywords): column read through a cold, then warm workbook cache
+    cache = WorkbookCache()
+    timer.time('ui.excel_load_cold', cache.read_column, path, column)
+    _, _, _, series = timer.time('ui.excel_load_warm', cache.read_column, path, column)
+    word_freq, total_words = timer.time('ui.tokenize', count_keywords, series.dropna(), taxonomy.stop_words)
+    taxonomy.matcher.match.cache_clear()
+    categorized = timer.time('ui.categorize', categorize_keywords, word_freq, taxonomy.matcher)
+    if render_html is not None:
+        result = KeywordAnalysis(column, len(series.dropna()), total_words, word_freq, categorized, taxonomy.name)
+        timer.time('ui.html_output', render_html, result)
+    return result
+
+
+def benchmark(rows, columns, words, unique_words, repeat, workdir, taxonomy, render_html=None, seed=0):
+    """Generate (or reuse) one workbook and time every stage repeat times."""
+    path = workdir / f'bench_{rows}r_{columns}c_{words}w_{unique_words}u_s{seed}.xlsx'
+    generated = None
+    if not path.exists():
+        start = time.perf_counter()
+        generate_workbook(path, rows, columns, words, unique_words, seed, taxonomy)
+        generated = round(time.perf_counter() - start, 3)
+
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeat):
+            result = run_stages(path, 'Prerequisites', Path(output_dir), timer, taxonomy, render_html)
+
+    return {
+        'rows': rows,
+        'columns': columns,
+        'words_per_cell': words,
+        'unique_words': unique_words,
+        'file_bytes': path.stat().st_size,
+        'generate_seconds': generated,
+        'records': result.records,
+        'unique_keywords': result.unique_keywords,
+        'total_words': result.total_words,
+        'stages': timer.summary(),
+    }
+
+
+def compare(results, baseline_path):
+    """Print per-stage median changes against a previous results file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {
+        (run['rows'], run['columns'], run['words_per_cell'], run['unique_words']): run['stages']
+        for run in baseline.get('runs', [])
+    }
+    print()
+    print(f"📈 Compared with {baseline_path} ({baseline.get('timestamp', 'unknown time')})")
+    for run in results['runs']:
+        key = (run['rows'], run['columns'], run['words_per_cell'], run['unique_words'])
+        if key not in previous:
+            continue
+        print(f"  {run['rows']} rows × {run['columns']} columns:")
+        for stage, timing in run['stages'].items():
+            before = previous[key].get(stage)
+            if not before or not before['median']:
+                continue
+            change = (timing['median'] - before['median']) / before['median'] * 100
+            print(f"    {stage:28s} {before['median']:10.4f}s → {timing['median']:10.4f}s  ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the keyword analysis pipeline on synthetic workbooks")
+    parser.add_argument("--rows", default="1000,10000,100000",
+                        help="comma-separated row counts (default: 1000,10000,100000)")
+    parser.add_argument("--columns", type=int, default=5, help="columns per sheet, at least 5 (default: 5)")
+    parser.add_argument("--words", type=int, default=12, help="average words per text cell (default: 12)")
+    parser.add_argument("--unique-words", type=int, default=500,
+                        help="random extra words in the vocabulary (default: 500)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per workbook (default: 3)")
+    parser.add_argument("--taxonomy", metavar="PATH", help="taxonomy file (default taxonomy.yaml)")
+    parser.add_argument("--workdir", default=".benchmarks", help="where generated workbooks are kept")
+    parser.add_argument("--no-html", action="store_true", help="skip the HTML stage (does not import gradio)")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="results file")
+    parser.add_argument("--compare", metavar="PATH", help="previous results file to compare against")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    taxonomy = load_taxonomy(args.taxonomy)
+    workdir = Path(args.workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    render_html = None
+    if not args.no_html:
+        from gradio_ecommerce_ui import render_analysis_html as render_html
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'engine_version': ENGINE_VERSION,
+        'taxonomy': taxonomy.name,
+        'repeat': args.repeat,
+        'runs': [],
+    }
+
+    print("=" * 80)
+    print("KEYWORD PIPELINE BENCHMARK")
+    print("=" * 80)
+    for rows in [int(r) for r in args.rows.split(',') if r.strip()]:
+        print(f"\n⏱️  {rows} rows × {args.columns} columns, ~{args.words} words per cell")
+        run = benchmark(rows, args.columns, args.words, args.unique_words, args.repeat, workdir, taxonomy,
+                        render_html)
+        if run['generate_seconds'] is not None:
+            print(f"  (generated workbook in {run['generate_seconds']:.1f}s)")
+        for stage, timing in run['stages'].items():
+            print(f"  {stage:28s} median {timing['median']:10.4f}s  min {timing['min']:10.4f}s")
+        results['runs'].append(run)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
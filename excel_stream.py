@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Streaming, column-projected reads of large Excel sheets (openpyxl read-only mode)
+"""
+
+from openpyxl import load_workbook
+
+# Cell strings pandas.read_excel treats as missing by default, so that both
+# read modes drop the same cells
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+
+
+def find_column(columns, column_name):
+    """Find a column by name (case-insensitive)."""
+    for col in columns:
+        if col.lower() == column_name.lower():
+            return col
+    return None
+
+
+def find_columns(columns, column_names):
+    """Find several columns by name (case-insensitive). Returns (found, missing)."""
+    found, missing = [], []
+    for name in column_names:
+        column = find_column(columns, name)
+        if column is None:
+            missing.append(name)
+        elif column not in found:
+            found.append(column)
+    return found, missing
+
+
+def split_columns(text, columns):
+    """Split a comma-separated list of column names, unless the whole text names one of columns.
+
+    A header may itself contain commas ("Steps, Expected Result").
+    """
+    text = (text or "").strip()
+    if ',' in text and find_column(columns, text) is not None:
+        return [text]
+    return [name.strip() for name in text.split(',') if name.strip()]
+
+
+def is_missing(value):
+    """Return True for cells pandas would read as NaN."""
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value
+    return isinstance(value, str) and value in NA_STRINGS
+
+
+def open_workbook(file_path):
+    """Open a workbook in read-only mode, e.g. to stream several of its sheets; close() it when done."""
+    return load_workbook(file_path, read_only=True, data_only=True)
+
+
+class ColumnStream:
+    """Header row of a sheet plus a lazy iterator over one column's non-empty cells.
+
+    Only one row is materialized at a time, so memory stays flat regardless of
+    how many rows or columns the sheet has. Iterate once; the workbook is
+    closed when iteration finishes or close() is called. A workbook passed in
+    (open_workbook(), to read several sheets of one file) is left open for its owner.
+    """
+
+    def __init__(self, file_path, column_name=None, sheet_name=None, match=None, workbook=None):
+        self._owns_workbook = workbook is None
+        self.workbook = load_workbook(file_path, read_only=True, data_only=True) if workbook is None else workbook
+        try:
+            self.sheet_names = self.workbook.sheetnames
+            self.sheet_name = sheet_name or self.sheet_names[0]
+            self.worksheet = self.workbook[self.sheet_name]
+
+            header = next(self.worksheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+            self.columns = [
+                str(value) if value is not None else f"Unnamed: {i}"
+                for i, value in enumerate(header)
+            ]
+
+            if match is not None:
+                self.column = next((col for col in self.columns if match(col)), None)
+            elif column_name:
+                self.column = find_column(self.columns, column_name)
+            else:
+                self.column = None
+        except Exception:
+            self.close()
+            raise
+
+    def __iter__(self):
+        if self.column is None:
+            self.close()
+            return
+
+        col_idx = self.columns.index(self.column) + 1
+        try:
+            rows = self.worksheet.iter_rows(min_row=2, min_col=col_idx, max_col=col_idx, values_only=True)
+            for (value,) in rows:
+                if not is_missing(value):
+                    yield value
+        finally:
+            self.close()
+
+    def iter_columns(self, names):
+        """Yield a tuple of the named columns' cells for every data row (missing cells as None).
+
+        One pass over the sheet however many columns are selected; the
+        workbook is closed when iteration finishes.
+        """
+        indexes = [self.columns.index(name) for name in names]
+        first = min(indexes, default=0)
+        try:
+            rows = self.worksheet.iter_rows(min_row=2, min_col=first + 1, max_col=max(indexes, default=0) + 1,
+                                            values_only=True)
+            positions = [i - first for i in indexes]
+            for row in rows:
+                yield tuple(
+                    None if i >= len(row) or is_missing(row[i]) else row[i] for i in positions
+                )
+        finally:
+            self.close()
+
+    def load(self):
+        """Read the whole sheet in one pass, returning (values, rows).
+
+        values lists the column's non-empty cells; rows counts data rows like
+        pandas.read_excel does (trailing empty rows are not counted), and
+        columns is trimmed of trailing empty columns the same way. A
+        pandas-free stand-in for loading the sheet into a DataFrame.
+        """
+        col_idx = self.columns.index(self.column) if self.column is not None else None
+        values = []
+        rows = 0
+        width = 0
+        try:
+            # Row 0 is the header again, read only to measure its width
+            for n, row in enumerate(self.worksheet.iter_rows(values_only=True)):
+                filled = [i for i, value in enumerate(row) if value is not None and value != '']
+                if filled:
+                    rows = n
+                    width = max(width, filled[-1] + 1)
+                if n and col_idx is not None and col_idx < len(row) and not is_missing(row[col_idx]):
+                    values.append(row[col_idx])
+        finally:
+            self.close()
+        self.columns = self.columns[:width]
+        return values, rows
+
+    def close(self):
+        if self.workbook is not None:
+            if self._owns_workbook:
+                self.workbook.close()
+            self.workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
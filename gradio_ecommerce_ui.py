@@ -3,196 +3,785 @@
 Enhanced Gradio UI for eCOMMERCE Excel Analysis with Custom Column Support
 """
 
-import gradio as gr
-import pandas as pd
-import re
-from collections import Counter, defaultdict
 from pathlib import Path
+import hashlib
+import multiprocessing
 import os
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html import escape
 
-def read_excel_file(file_path):
-    """Read and display Excel file contents."""
+from instrumentation import Profile, get_recent_runs
+from keyword_engine import (
+    KeywordAnalysis, categorize_columns, categorize_keywords, count_keywords, count_keywords_approx,
+    count_keywords_rows, count_keywords_stream, load_taxonomy, text_columns,
+)
+
+# gradio, openpyxl (excel_stream) and pandas (workbook_cache) are imported where
+# first used, so importing this module, as every analysis pool worker may, stays cheap
+
+# Rows per preview page in the Read Excel File tab
+PREVIEW_ROWS = 10
+
+
+def _parse_columns(columns):
+    """Split a comma-separated column list; empty means all columns."""
+    return [c.strip() for c in (columns or "").split(",") if c.strip()]
+
+
+def _split_columns(file_path, columns, stream=False):
+    """Split a comma-separated column list, unless the whole text names one column.
+
+    A header may itself contain commas ("Steps, Expected Result"); the sheet's
+    header (streamed, or from the workbook cache) is only consulted when the
+    text has a comma.
+    """
+    from excel_stream import ColumnStream
+    from workbook_cache import read_column
+    
+    names = _parse_columns(columns)
+    if len(names) > 1:
+        whole = columns.strip()
+        if stream:
+            with ColumnStream(file_path, column_name=whole) as column_stream:
+                column = column_stream.column
+        else:
+            column = read_column(file_path, whole)[2]
+        if column is not None:
+            return [whole]
+    return names
+
+
+def read_excel_file(file_path, page=1, page_size=PREVIEW_ROWS, columns=None):
+    """Show one page of an Excel sheet.
+
+    A generator: yields a progress message, then (html, page) with page clamped
+    to range. columns is a comma-separated subset of columns to preview (default: all).
+    """
+    from workbook_cache import read_page
+    
     try:
         if not file_path or not os.path.exists(file_path):
-            return "❌ File not found. Please provide a valid file path.", None
+            yield "❌ File not found. Please provide a valid file path.", 1
+            return
         
-        excel_file = pd.ExcelFile(file_path)
-        sheet_name = excel_file.sheet_names[0]
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        yield _progress(1, f"Reading {Path(file_path).name}…", steps=1), page or 1
+        page_size = max(int(page_size or PREVIEW_ROWS), 1)
+        sheet_name, all_columns, total_rows, page, df = read_page(
+            file_path, page or 1, page_size, _split_columns(file_path, columns)
+        )
+        pages = max((total_rows + page_size - 1) // page_size, 1)
+        first_row = (page - 1) * page_size + 1
         
         # Create HTML table
         html_table = f"""
         <div style="font-family: Arial, sans-serif; padding: 20px;">
-            <h3>📁 File: {Path(file_path).name}</h3>
-            <p><strong>Sheet:</strong> {sheet_name}</p>
-            <p><strong>Size:</strong> {df.shape[0]} rows × {df.shape[1]} columns</p>
-            <p><strong>Columns:</strong> {', '.join(df.columns)}</p>
+            <h3>📁 File: {escape(Path(file_path).name)}</h3>
+            <p><strong>Sheet:</strong> {escape(str(sheet_name))}</p>
+            <p><strong>Size:</strong> {total_rows} rows × {len(all_columns)} columns</p>
+            <p><strong>Columns:</strong> {escape(', '.join(map(str, all_columns)))}</p>
             <hr>
-            <h4>Preview Data:</h4>
-            {df.head(10).to_html(index=False, border=1)}
+            <h4>Preview Data (rows {first_row}–{first_row + len(df) - 1}, page {page} of {pages}):</h4>
+            {df.to_html(index=False, border=1)}
         </div>
         """
         
-        return html_table, df.to_csv(index=False)
+        yield html_table, page
+    except Exception as e:
+        yield f"❌ Error reading file: {str(e)}", 1
+
+
+def preview_first_page(file_path, page, page_size, columns):
+    yield from read_excel_file(file_path, 1, page_size, columns)
+
+
+def preview_previous_page(file_path, page, page_size, columns):
+    yield from read_excel_file(file_path, (page or 1) - 1, page_size, columns)
+
+
+def preview_next_page(file_path, page, page_size, columns):
+    yield from read_excel_file(file_path, (page or 1) + 1, page_size, columns)
+
+
+# CSV exports live in one directory, one file per workbook version and column
+# selection, reused by later clicks; only the most recently used files are kept
+EXPORT_DIR = Path(os.getenv("UI_EXPORT_DIR", Path(tempfile.gettempdir()) / "excel_exports"))
+EXPORT_MAX_FILES = int(os.getenv("UI_EXPORT_MAX_FILES", "8"))
+
+
+def _export_path(file_path, columns):
+    """Export file for the current on-disk version (path, mtime, size) of a workbook and a column selection."""
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    key = repr((path, stat.st_mtime_ns, stat.st_size, [c.lower() for c in columns]))
+    return EXPORT_DIR / f"{Path(path).stem}-{hashlib.sha256(key.encode()).hexdigest()[:16]}.csv"
+
+
+def _prune_exports(keep=EXPORT_MAX_FILES):
+    """Delete all but the keep most recently used exports."""
+    exports = sorted(EXPORT_DIR.glob("*.csv"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in exports[keep:]:
+        stale.unlink(missing_ok=True)
+
+
+def export_excel_csv(file_path, columns=None):
+    """Export the sheet (or the selected columns) to a CSV file for download.
+
+    An unchanged workbook exported with the same columns again reuses the earlier file.
+    """
+    import gradio as gr
+    from workbook_cache import export_csv
+    
+    if not file_path or not os.path.exists(file_path):
+        raise gr.Error("File not found. Please provide a valid file path.")
+    try:
+        names = _split_columns(file_path, columns)
+        dest = _export_path(file_path, names)
+        if dest.exists():
+            os.utime(dest)
+        else:
+            EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name so a concurrent click never serves a partial file
+            partial = dest.with_name(f"{dest.name}.{threading.get_ident()}.partial")
+            try:
+                export_csv(file_path, partial, names)
+                os.replace(partial, dest)
+            finally:
+                partial.unlink(missing_ok=True)
+        _prune_exports()
+        return str(dest)
     except Exception as e:
-        return f"❌ Error reading file: {str(e)}", None
+        raise gr.Error(f"Error exporting file: {str(e)}")
+
+
+# Concurrency settings (override through the environment): analysis worker
+# processes, handlers running at once per event, and requests allowed to wait
+ANALYSIS_WORKERS = int(os.getenv("UI_ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))))
+CONCURRENCY_LIMIT = int(os.getenv("UI_CONCURRENCY_LIMIT", "4"))
+MAX_QUEUE_SIZE = int(os.getenv("UI_MAX_QUEUE", "64"))
+
+_analysis_pool = None
+_analysis_pool_lock = threading.Lock()
+
+
+def analysis_pool():
+    """Process pool shared by all sessions for tokenizing and categorizing, created on first use.
+
+    Workers are spawned rather than forked: a fork of the multi-threaded server
+    could inherit a lock (logging, taxonomy, workbook cache) held by another
+    thread and deadlock. Spawning is cheap since this module imports little.
+    """
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return _analysis_pool
+
+
+def _run_in_pool(fn, *args):
+    """Run fn in the analysis pool, replacing the pool if a worker died."""
+    global _analysis_pool
+    pool = analysis_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        with _analysis_pool_lock:
+            if _analysis_pool is pool:
+                _analysis_pool = None
+        raise
+
+
+def _tokenize_job(text_data, taxonomy_path):
+    """Worker: count keywords of a Series of cell values. Returns (word_freq, total_words, records)."""
+    word_freq, total_words = count_keywords(text_data, load_taxonomy(taxonomy_path).stop_words)
+    return word_freq, total_words, len(text_data)
+
+
+def _tokenize_stream_job(file_path, column_name, taxonomy_path):
+    """Worker: stream one column from the workbook and count its keywords."""
+    from excel_stream import ColumnStream
+    
+    column_stream = ColumnStream(file_path, column_name=column_name)
+    return count_keywords_stream(column_stream, load_taxonomy(taxonomy_path).stop_words)
+
+
+def _tokenize_approx_job(values, capacity, taxonomy_path):
+    """Worker: count keywords of cell values into a SpaceSaving sketch. Returns (sketch, total_words, records)."""
+    return count_keywords_approx(values, load_taxonomy(taxonomy_path).stop_words, capacity)
+
+
+def _tokenize_approx_stream_job(file_path, column_name, capacity, taxonomy_path):
+    """Worker: stream one column from the workbook into a SpaceSaving sketch of at most capacity keywords."""
+    from excel_stream import ColumnStream
+    
+    column_stream = ColumnStream(file_path, column_name=column_name)
+    return count_keywords_approx(column_stream, load_taxonomy(taxonomy_path).stop_words, capacity)
+
+
+def _categorize_job(word_freq, taxonomy_path):
+    """Worker: categorize counted keywords."""
+    return categorize_keywords(word_freq, load_taxonomy(taxonomy_path).matcher)
+
+
+def _tokenize_columns_job(frame, taxonomy_path):
+    """Worker: count keywords of every column of a DataFrame. Returns [(word_freq, total_words, records)]."""
+    stop_words = load_taxonomy(taxonomy_path).stop_words
+    counted = []
+    for col in frame.columns:
+        text_data = frame[col].dropna()
+        word_freq, total_words = count_keywords(text_data, stop_words)
+        counted.append((word_freq, total_words, len(text_data)))
+    return counted
 
 
-def analyze_keywords(file_path, column_name):
-    """Analyze keywords from specified column."""
+def _tokenize_columns_stream_job(file_path, columns, taxonomy_path):
+    """Worker: stream several columns from the workbook in one pass over its rows and count their keywords."""
+    from excel_stream import ColumnStream
+    
+    column_stream = ColumnStream(file_path)
+    return count_keywords_rows(column_stream.iter_columns(columns), len(columns),
+                               load_taxonomy(taxonomy_path).stop_words)
+
+
+def _categorize_columns_job(columns, counted, taxonomy_path):
+    """Worker: categorize per-column counts. Returns (per-column results, combined result)."""
+    return categorize_columns(columns, counted, load_taxonomy(taxonomy_path))
+
+
+def _progress(step, message, steps=4):
+    return f"""
+    <div style="font-family: Arial, sans-serif; padding: 20px;">
+        <p>⏳ <strong>Step {step}/{steps}:</strong> {escape(message)}</p>
+    </div>
+    """
+
+
+def analyze_keywords(file_path, column_name, stream=False, taxonomy_path=None, approx=None):
+    """Analyze keywords from specified column.
+
+    A generator: yields (html, None) progress updates for each stage (reading,
+    tokenizing, categorizing, rendering), then (html, KeywordAnalysis). The
+    result stays None when the analysis failed. Tokenizing and categorizing
+    run in the shared analysis process pool. Stage timings are recorded for
+    the Diagnostics tab (CPU time there is this server process only), failed
+    runs included with their error.
+    Unless streaming, the keyword -> row index used by the drill-down panel
+    is built too (once per workbook version, see workbook_cache.keyword_index).
+    With stream=True only the requested column is read, row by row, in openpyxl
+    read-only mode instead of loading the whole sheet into a DataFrame.
+    taxonomy_path selects a taxonomy file other than the default taxonomy.yaml.
+    column_name may list several columns, or be 'all' for every text column;
+    see _analyze_columns.
+    With approx=N (N > 0) at most N keywords of one column are tracked in a
+    SpaceSaving sketch, so counts are upper-bound estimates; the row index is
+    then left to the first drill-down, as after streaming.
+    """
+    from excel_stream import ColumnStream
+    from workbook_cache import keyword_index, read_column
+    
     try:
         if not file_path or not os.path.exists(file_path):
-            return "❌ File not found. Please provide a valid file path."
+            yield "❌ File not found. Please provide a valid file path.", None
+            return
         
         if not column_name or column_name.strip() == "":
-            return "❌ Please specify the column name to analyze."
-        
-        # Read Excel file
-        excel_file = pd.ExcelFile(file_path)
-        sheet_name = excel_file.sheet_names[0]
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+            yield "❌ Please specify the column name to analyze.", None
+            return
         
-        # Find column (case-insensitive)
-        target_col = None
-        for col in df.columns:
-            if col.lower() == column_name.lower():
-                target_col = col
-                break
+        approx = max(int(approx or 0), 0)
+        names = _split_columns(file_path, column_name, stream)
+        if len(names) > 1 or [name.lower() for name in names] == ['all']:
+            if approx:
+                yield "❌ Approximate mode analyzes one column at a time.", None
+                return
+            yield from _analyze_columns(file_path, names, stream, taxonomy_path)
+            return
         
-        if not target_col:
-            available = ', '.join(df.columns)
-            return f"❌ Column '{column_name}' not found.\n\nAvailable columns: {available}"
+        taxonomy_path = taxonomy_path or None
+        taxonomy = load_taxonomy(taxonomy_path)
+        with Profile('gradio.analyze_keywords', file=Path(file_path).name, column=column_name,
+                     mode=('stream' if stream else 'cached') + ('+approx' if approx else '')) as run:
+            index_rows = not stream and not approx
+            steps = 5 if index_rows else 4
+            
+            yield _progress(1, f"Reading {Path(file_path).name}…", steps), None
+            with run.stage('excel_load') as stage:
+                if stream:
+                    # Only the header is read here; the worker streams the column itself
+                    with ColumnStream(file_path, column_name=column_name) as column_stream:
+                        columns = column_stream.columns
+                        target_col = column_stream.column
+                else:
+                    # Read the column (parsed once per file version, then served from cache or sidecar)
+                    sheet_name, columns, target_col, text_data = read_column(file_path, column_name)
+                    stage.update(sheet_rows=len(text_data) if text_data is not None else 0)
+            
+            if not target_col:
+                available = ', '.join(columns)
+                run.finish(error=f"column '{column_name}' not found")
+                yield f"❌ Column '{column_name}' not found.\n\nAvailable columns: {available}", None
+                return
+            
+            sketch = None
+            if not stream:
+                text_data = text_data.dropna()
+            if approx:
+                yield _progress(2, f"Counting the top {approx} keywords of '{target_col}'…", steps), None
+                with run.stage('approx_tokenize') as stage:
+                    if stream:
+                        sketch, total_words, records = _run_in_pool(
+                            _tokenize_approx_stream_job, file_path, target_col, approx, taxonomy_path
+                        )
+                    else:
+                        sketch, total_words, records = _run_in_pool(
+                            _tokenize_approx_job, text_data, approx, taxonomy_path
+                        )
+                    word_freq = Counter(sketch.counts)
+                    stage.update(rows=records, words=total_words, keywords=len(word_freq), max_error=sketch.floor)
+            elif stream:
+                yield _progress(2, f"Tokenizing '{target_col}' (streaming)…", steps), None
+                with run.stage('stream_tokenize') as stage:
+                    word_freq, total_words, records = _run_in_pool(
+                        _tokenize_stream_job, file_path, target_col, taxonomy_path
+                    )
+                    stage.update(rows=records, words=total_words, keywords=len(word_freq))
+            else:
+                yield _progress(2, f"Tokenizing {len(text_data)} rows of '{target_col}'…", steps), None
+                with run.stage('tokenize') as stage:
+                    word_freq, total_words, records = _run_in_pool(_tokenize_job, text_data, taxonomy_path)
+                    stage.update(rows=records, words=total_words, keywords=len(word_freq))
+            
+            yield _progress(3, f"Categorizing {len(word_freq)} keywords…", steps), None
+            with run.stage('categorize') as stage:
+                categorized = _run_in_pool(_categorize_job, word_freq, taxonomy_path)
+                stage.update(categories=len(categorized))
+            result = KeywordAnalysis(target_col, records, total_words, word_freq, categorized, taxonomy.name, sketch)
+            
+            if index_rows:
+                yield _progress(4, f"Indexing rows of '{target_col}'…", steps), None
+                with run.stage('index') as stage:
+                    _, _, index = keyword_index(file_path, target_col, taxonomy)
+                    stage.update(keywords=len(index.keywords), postings=len(index.row_ids), index_bytes=index.nbytes)
+            
+            yield _progress(steps, "Rendering results…", steps), None
+            with run.stage('html_output') as stage:
+                html_output = render_analysis_html(result)
+                stage.update(html_bytes=len(html_output))
+            run.finish()
+            yield html_output, result
+    
+    except Exception as e:
+        yield f"❌ Error during analysis: {str(e)}", None
+
+
+def _analyze_columns(file_path, names, stream=False, taxonomy_path=None):
+    """analyze_keywords for several columns (or ['all'] text columns) with a single read of the sheet.
+
+    Yields progress, then (html, combined KeywordAnalysis); the html shows the
+    combined result and each column's own. Streaming tokenizes every column in
+    one pass over the rows; otherwise the cached sheet is tokenized column by column.
+    """
+    from excel_stream import ColumnStream, find_columns
+    from workbook_cache import keyword_index, read_sheet
+    
+    every = [name.lower() for name in names] == ['all']
+    taxonomy_path = taxonomy_path or None
+    taxonomy = load_taxonomy(taxonomy_path)
+    with Profile('gradio.analyze_keywords', file=Path(file_path).name, column=', '.join(names),
+                 mode='stream+columns' if stream else 'cached+columns') as run:
+        steps = 4 if stream else 5
         
-        # Extract data
-        text_data = df[target_col].dropna()
+        yield _progress(1, f"Reading {Path(file_path).name}…", steps), None
+        with run.stage('excel_load') as stage:
+            if stream:
+                with ColumnStream(file_path) as column_stream:
+                    columns = column_stream.columns
+                found, missing = (columns, []) if every else find_columns(columns, names)
+            else:
+                sheet_name, df = read_sheet(file_path)
+                columns = list(df.columns)
+                found, missing = (text_columns(df), []) if every else find_columns(columns, names)
+                stage.update(sheet_rows=len(df), sheet_columns=len(columns))
         
-        # Define common words to filter out
-        common_words = {'the', 'and', 'or', 'a', 'an', 'in', 'is', 'has', 'with', 'for', 'to', 'of', 'at', 'by', 'from', 'on', 'that', 'this', 'as', 'be', 'are', 'was', 'were', 'been', 'being', 'have', 'should', 'must', 'can', 'will', 'may', 'could', 'would', 'it', 'its', 'if', 'exists', 'exist', 'under', 'also', 'only', 'not', 'just', 'some', 'more', 'no', 'up', 'out', 'so', 'do', 'does', 'did', 'then', 'there', 'here', 'each', 'all', 'which', 'when', 'what', 'where', 'who', 'why', 'how'}
+        if missing or not found:
+            available = ', '.join(map(str, columns))
+            run.finish(error=f"column(s) not found: {', '.join(missing) or 'no text columns'}")
+            yield (f"❌ Column(s) not found: {', '.join(missing) or 'no text columns'}\n\n"
+                   f"Available columns: {available}"), None
+            return
         
-        all_text = ' '.join([str(v) for v in text_data])
-        words = re.findall(r'\b[a-zA-Z_]+\b', all_text.lower())
-        word_freq = Counter([w for w in words if len(w) > 2 and w not in common_words])
+        if stream:
+            yield _progress(2, f"Tokenizing {len(found)} columns in one pass (streaming)…", steps), None
+            with run.stage('multi_tokenize') as stage:
+                counted = _run_in_pool(_tokenize_columns_stream_job, file_path, found, taxonomy_path)
+                if every:
+                    found = [col for col, c in zip(found, counted) if c[3]]
+                    counted = [c for c in counted if c[3]]
+                stage.update(columns=len(found), words=sum(c[1] for c in counted))
+        else:
+            yield _progress(2, f"Tokenizing {len(found)} columns of {len(df)} rows…", steps), None
+            with run.stage('multi_tokenize') as stage:
+                counted = _run_in_pool(_tokenize_columns_job, df[found], taxonomy_path)
+                stage.update(columns=len(found), words=sum(c[1] for c in counted))
         
-        # Define categories
-        categories = {
-            'User/Account': ['user', 'account', 'email', 'pwd', 'login', 'email_addr', 'emailid', 'username', 'password'],
-            'Product/Catalog': ['product', 'cart', 'item', 'catalog', 'category', 'sku', 'inventory'],
-            'Order/Payment': ['order', 'checkout', 'payment', 'invoice', 'bill', 'transaction', 'purchase'],
-            'Shipping/Delivery': ['shipping', 'delivery', 'address', 'zip', 'postal', 'package', 'warehouse'],
-            'Status': ['status', 'processing', 'delivered', 'completed', 'pending', 'confirmed'],
-            'Refund/Return': ['refund', 'return', 'exchange', 'cancel', 'reverse'],
-            'Pricing/Discount': ['price', 'discount', 'coupon', 'promo', 'tax', 'fee'],
-            'Search/Filter': ['search', 'filter', 'sort', 'browse', 'find'],
-        }
+        yield _progress(3, f"Categorizing keywords of {len(found)} columns…", steps), None
+        with run.stage('categorize') as stage:
+            results, result = _run_in_pool(_categorize_columns_job, found, counted, taxonomy_path)
+            stage.update(categories=len(result.categorized))
         
-        # Categorize keywords
-        categorized = defaultdict(lambda: {'keywords': [], 'counts': []})
-        uncategorized = []
+        if not stream:
+            yield _progress(4, f"Indexing rows of {len(found)} columns…", steps), None
+            with run.stage('index') as stage:
+                _, _, index = keyword_index(file_path, found, taxonomy)
+                stage.update(keywords=len(index.keywords), postings=len(index.row_ids), index_bytes=index.nbytes)
         
-        for word in word_freq.keys():
-            found = False
-            for category, keywords in categories.items():
-                if any(kw in word for kw in keywords):
-                    categorized[category]['keywords'].append(word)
-                    categorized[category]['counts'].append(word_freq[word])
-                    found = True
-                    break
-            if not found:
-                uncategorized.append((word, word_freq[word]))
+        yield _progress(steps, "Rendering results…", steps), None
+        with run.stage('html_output') as stage:
+            html_output = render_columns_html(results, result)
+            stage.update(html_bytes=len(html_output))
+        run.finish()
+        yield html_output, result
+
+
+# Styles shared by every result table, sent once per render instead of per cell
+REPORT_CSS = """
+<style>
+    .kw-report { font-family: Arial, sans-serif; padding: 20px; background-color: #f9f9f9; }
+    .kw-report table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }
+    .kw-report th, .kw-report td { padding: 12px; border: 1px solid #ddd; text-align: left; background-color: #ffffff; }
+    .kw-report th { color: white; }
+    .kw-report .num { text-align: center; }
+    .kw-report .summary th { background-color: #4CAF50; }
+    .kw-report .detail th { background-color: #2196F3; }
+    .kw-report .summary .other td { background-color: #f0f0f0; }
+    .kw-report .detail .other td { background-color: #f9f9f9; }
+    .kw-report .cat { font-weight: bold; }
+    .kw-report .kw { font-family: monospace; }
+    .kw-report .more td { color: #666; font-style: italic; }
+</style>
+"""
+
+# Keywords listed per category in the first render; the rest is paged on demand,
+# so the payload stays the same size however many unique keywords a column has
+TOP_KEYWORDS = int(os.getenv("KEYWORD_TOP_N", "10"))
+PAGE_SIZE = 100
+
+
+def _row_class(category):
+    return ' class="other"' if category == 'Other' else ''
+
+
+def render_analysis_html(result, top_n=TOP_KEYWORDS, css=True):
+    """Render a KeywordAnalysis as the summary table plus the top_n keywords of each category."""
+    parts = [REPORT_CSS if css else "", f"""
+    <div class="kw-report">
+        <h3>📊 Keyword Analysis Results</h3>
+        <p><strong>Column Analyzed:</strong> {escape(str(result.column))}</p>
+        <p><strong>Total Records:</strong> {result.records}</p>
+        <p><strong>Unique Keywords:</strong> {result.unique_keywords}</p>
+        <p><strong>Total Occurrences:</strong> {result.total_words}</p>
+        {_approx_note(result)}
+        <hr>
         
-        if uncategorized:
-            categorized['Other'] = {
-                'keywords': [w[0] for w in uncategorized],
-                'counts': [w[1] for w in uncategorized]
-            }
+        <h4>Category Summary</h4>
+        <table class="summary">
+            <tr><th>Category</th><th class="num">Keywords</th><th class="num">Total Count</th><th class="num">% of Total</th></tr>
+    """]
+    
+    for row in result.summary_rows():
+        parts.append(
+            f"<tr{_row_class(row['Category'])}><td class=\"cat\">{escape(row['Category'])}</td>"
+            f"<td class=\"num\">{row['Keywords']}</td><td class=\"num\">{row['Total Count']}</td>"
+            f"<td class=\"num\">{row['Percentage']}</td></tr>"
+        )
+    
+    parts.append(f"""
+        </table>
         
-        # Build HTML table
-        html_output = f"""
-        <div style="font-family: Arial, sans-serif; padding: 20px; background-color: #f9f9f9;">
-            <h3>📊 Keyword Analysis Results</h3>
-            <p><strong>Column Analyzed:</strong> {target_col}</p>
-            <p><strong>Total Records:</strong> {len(text_data)}</p>
-            <p><strong>Unique Keywords:</strong> {len(word_freq)}</p>
-            <p><strong>Total Occurrences:</strong> {len(words)}</p>
-            <hr>
-            
-            <h4>Category Summary</h4>
-            <table style="border-collapse: collapse; width: 100%; margin-bottom: 20px;">
-                <tr style="background-color: #4CAF50; color: white;">
-                    <th style="padding: 12px; text-align: left; border: 1px solid #ddd;">Category</th>
-                    <th style="padding: 12px; text-align: center; border: 1px solid #ddd;">Keywords</th>
-                    <th style="padding: 12px; text-align: center; border: 1px solid #ddd;">Total Count</th>
-                    <th style="padding: 12px; text-align: center; border: 1px solid #ddd;">% of Total</th>
-                </tr>
-        """
+        <h4>Detailed Keyword Breakdown (top {top_n} per category)</h4>
+        <table class="detail">
+            <tr><th>Category</th><th>Keyword</th><th class="num">Count</th><th class="num">% of Total</th></tr>
+    """)
+    
+    for category in result.categories():
+        pairs = result.category_keywords(category)
+        for keyword, count in pairs[:top_n]:
+            parts.append(_keyword_row(result, category, keyword, count))
+        if len(pairs) > top_n:
+            parts.append(
+                f"<tr class=\"more\"><td colspan=\"4\">… {len(pairs) - top_n} more keyword(s) in "
+                f"{escape(category)} — use “Browse all keywords” below</td></tr>"
+            )
+    
+    parts.append("</table></div>")
+    return "".join(parts)
+
+
+def _approx_note(result):
+    """Error bounds of an approximate (SpaceSaving) result, or nothing for an exact one."""
+    if not result.approximate:
+        return ""
+    sketch = result.sketch
+    max_error = max(sketch.errors.values(), default=0)
+    return (
+        f"<p>≈ <strong>Approximate:</strong> {len(sketch.counts)} of at most {sketch.capacity} keywords "
+        f"tracked; counts overestimate by at most {max_error}, and untracked keywords occurred at most "
+        f"{sketch.floor} times.</p>"
+    )
+
+
+def render_columns_html(results, combined, top_n=TOP_KEYWORDS):
+    """Render a multi-column analysis: the combined result, then each column in a collapsible section."""
+    parts = [render_analysis_html(combined, top_n)]
+    for result in results:
+        parts.append(
+            f"<details class=\"kw-report\"><summary><strong>📋 {escape(str(result.column))}</strong>: "
+            f"{result.records} records, {result.unique_keywords} unique keywords, "
+            f"{result.total_words} occurrences</summary>{render_analysis_html(result, top_n, css=False)}</details>"
+        )
+    return "".join(parts)
+
+
+def _keyword_row(result, category, keyword, count):
+    return (
+        f"<tr{_row_class(category)}><td>{escape(category)}</td><td class=\"kw\">{escape(keyword)}</td>"
+        f"<td class=\"num\">{count}</td><td class=\"num\">{result.percentage(count)}</td></tr>"
+    )
+
+
+def render_keyword_page(result, category, page=1, page_size=PAGE_SIZE):
+    """Render one page of a category's keywords. Returns (html, page) with page clamped to range."""
+    if result is None:
+        return "❌ Run an analysis first.", 1
+    if category not in result.categorized:
+        return "❌ Please select a category.", 1
+    
+    pairs = result.category_keywords(category)
+    page_size = max(int(page_size or PAGE_SIZE), 1)
+    pages = max((len(pairs) + page_size - 1) // page_size, 1)
+    page = min(max(int(page or 1), 1), pages)
+    start = (page - 1) * page_size
+    
+    parts = [REPORT_CSS, f"""
+    <div class="kw-report">
+        <p><strong>{escape(category)}:</strong> keywords {min(start + 1, len(pairs))}–{min(start + page_size, len(pairs))}
+        of {len(pairs)} (page {page} of {pages})</p>
+        <table class="detail">
+            <tr><th>Category</th><th>Keyword</th><th class="num">Count</th><th class="num">% of Total</th></tr>
+    """]
+    for keyword, count in pairs[start:start + page_size]:
+        parts.append(_keyword_row(result, category, keyword, count))
+    parts.append("</table></div>")
+    return "".join(parts), page
+
+
+def category_choices(result):
+    """Update the category dropdown of the keyword browser after an analysis."""
+    import gradio as gr
+    
+    categories = result.categories() if result is not None else []
+    return gr.update(choices=categories, value=categories[0] if categories else None)
+
+
+def keyword_browser(result_state):
+    """Build the controls that page through all keywords of one category of result_state.
+
+    Returns the category dropdown, to be refreshed with category_choices after each analysis.
+    """
+    import gradio as gr
+    
+    with gr.Accordion("🔎 Browse all keywords", open=False):
+        with gr.Row():
+            category = gr.Dropdown(label="Category", choices=[])
+            page = gr.Number(label="Page", value=1, precision=0, minimum=1)
+            page_size = gr.Dropdown(label="Keywords per page", choices=[50, 100, 500], value=PAGE_SIZE)
+        with gr.Row():
+            prev_btn = gr.Button("◀ Previous")
+            show_btn = gr.Button("Show", variant="primary")
+            next_btn = gr.Button("Next ▶")
+        page_output = gr.HTML()
+    
+    inputs = [result_state, category, page, page_size]
+    outputs = [page_output, page]
+    show_btn.click(render_keyword_page, inputs=inputs, outputs=outputs)
+    prev_btn.click(lambda r, c, p, n: render_keyword_page(r, c, (p or 1) - 1, n), inputs=inputs, outputs=outputs)
+    next_btn.click(lambda r, c, p, n: render_keyword_page(r, c, (p or 1) + 1, n), inputs=inputs, outputs=outputs)
+    category.change(lambda r, c, n: render_keyword_page(r, c, 1, n),
+                    inputs=[result_state, category, page_size], outputs=outputs)
+    return category
+
+
+# Matching rows shown per drill-down page
+DRILL_ROWS = 25
+
+
+def keyword_table(result, top_n=TOP_KEYWORDS):
+    """[category, keyword, count] rows of the top_n keywords per category, for the drill-down table."""
+    if result is None:
+        return []
+    return [
+        [category, keyword, count]
+        for category in result.categories()
+        for keyword, count in result.category_keywords(category)[:top_n]
+    ]
+
+
+def drill_down(file_path, column_name, taxonomy_path, result, category, keywords, mode="OR", page=1,
+               page_size=DRILL_ROWS):
+    """Show one page of the rows matching keywords (AND/OR), or else any keyword of category.
+
+    column_name may list several columns (or 'all' text columns), as analyzed;
+    a row then matches a keyword found in any of them. Returns (html, page).
+    Row numbers are the rows in Excel (the header is row 1).
+    """
+    from workbook_cache import keyword_index, read_sheet
+    
+    if result is None:
+        return "❌ Run an analysis first.", 1
+    try:
+        taxonomy = load_taxonomy(taxonomy_path or None)
+        names = _split_columns(file_path, column_name)
+        if [name.lower() for name in names] == ['all']:
+            names = text_columns(read_sheet(file_path)[1])
+        if not names:
+            return "❌ Enter the analyzed column(s).", 1
+        sheet_name, column, index = keyword_index(file_path, names[0] if len(names) == 1 else names, taxonomy)
+        words = [word.lower() for word in _parse_columns(keywords)]
+        if words:
+            row_ids = index.query(words, mode.lower())
+            label = f" {mode} ".join(words)
+        elif category in result.categorized:
+            row_ids = index.category_rows(result, category)
+            label = f"any {category} keyword"
+        else:
+            return "❌ Enter keywords or select a category.", 1
         
-        # Add category rows
-        for category in sorted(categorized.keys()):
-            num_keywords = len(categorized[category]['keywords'])
-            total_count = sum(categorized[category]['counts'])
-            percentage = f"{(total_count/len(words)*100):.1f}%"
-            
-            html_output += f"""
-                <tr style="background-color: {'#f0f0f0' if category == 'Other' else '#ffffff'};">
-                    <td style="padding: 12px; border: 1px solid #ddd; font-weight: bold;">{category}</td>
-                    <td style="padding: 12px; border: 1px solid #ddd; text-align: center;">{num_keywords}</td>
-                    <td style="padding: 12px; border: 1px solid #ddd; text-align: center;">{total_count}</td>
-                    <td style="padding: 12px; border: 1px solid #ddd; text-align: center;">{percentage}</td>
-                </tr>
-            """
+        page_size = max(int(page_size or DRILL_ROWS), 1)
+        pages = max((len(row_ids) + page_size - 1) // page_size, 1)
+        page = min(max(int(page or 1), 1), pages)
+        page_ids = row_ids[(page - 1) * page_size:page * page_size]
+        _, df = read_sheet(file_path, sheet_name)
+        rows = df.iloc[page_ids]
+        rows.insert(0, 'Row', page_ids.astype('int64') + 2)
         
-        html_output += """
-            </table>
-            
-            <h4>Detailed Keyword Breakdown</h4>
-            <table style="border-collapse: collapse; width: 100%;">
-                <tr style="background-color: #2196F3; color: white;">
-                    <th style="padding: 12px; text-align: left; border: 1px solid #ddd;">Category</th>
-                    <th style="padding: 12px; text-align: left; border: 1px solid #ddd;">Keyword</th>
-                    <th style="padding: 12px; text-align: center; border: 1px solid #ddd;">Count</th>
-                    <th style="padding: 12px; text-align: center; border: 1px solid #ddd;">% of Total</th>
-                </tr>
+        html = f"""
+        <div style="font-family: Arial, sans-serif; padding: 20px;">
+            <p><strong>{len(row_ids)}</strong> of {len(df)} rows contain {escape(label)}
+            in '{escape(str(column))}' (page {page} of {pages})</p>
+            {rows.to_html(index=False, border=1)}
+        </div>
         """
-        
-        # Add detailed rows
-        for category in sorted(categorized.keys()):
-            keywords_list = categorized[category]['keywords']
-            counts_list = categorized[category]['counts']
-            
-            for keyword, count in sorted(zip(keywords_list, counts_list), key=lambda x: x[1], reverse=True):
-                percentage = f"{(count/len(words)*100):.1f}%"
-                html_output += f"""
-                <tr style="background-color: {'#ffffff' if category != 'Other' else '#f9f9f9'};">
-                    <td style="padding: 12px; border: 1px solid #ddd;">{category}</td>
-                    <td style="padding: 12px; border: 1px solid #ddd; font-family: monospace;">{keyword}</td>
-                    <td style="padding: 12px; border: 1px solid #ddd; text-align: center;">{count}</td>
-                    <td style="padding: 12px; border: 1px solid #ddd; text-align: center;">{percentage}</td>
-                </tr>
-                """
-        
-        html_output += "</table></div>"
-        
-        return html_output
-    
+        return html, page
     except Exception as e:
-        return f"❌ Error during analysis: {str(e)}"
+        return f"❌ Error during drill-down: {str(e)}", 1
+
+
+def drill_down_choices(result):
+    """Refresh the drill-down table and category dropdown after an analysis."""
+    import gradio as gr
+    
+    categories = result.categories() if result is not None else []
+    return keyword_table(result), gr.update(choices=categories, value=None)
+
+
+def row_drill_down(result_state, file_input, column_input, taxonomy_input):
+    """Build the panel that lists the rows behind a keyword, a category or an AND/OR keyword query.
+
+    Returns (table, category) to be refreshed with drill_down_choices after each analysis.
+    """
+    import gradio as gr
+    
+    def select_keyword(table, evt: gr.SelectData):
+        # A clicked category cell queries the whole category, a keyword cell just that keyword
+        row, col = evt.index
+        category, keyword = table.iloc[row, 0], table.iloc[row, 1]
+        return category, ("" if col == 0 else keyword)
+    
+    with gr.Accordion("🎯 Drill down to rows", open=False):
+        gr.Markdown("Click a category or keyword below, or enter keywords, to list the matching rows.")
+        table = gr.Dataframe(headers=["Category", "Keyword", "Count"], interactive=False)
+        with gr.Row():
+            category = gr.Dropdown(label="Category", choices=[])
+            keywords = gr.Textbox(label="Keywords", placeholder="Comma-separated, e.g., checkout, payment")
+            mode = gr.Radio(label="Match", choices=["OR", "AND"], value="OR")
+        with gr.Row():
+            page = gr.Number(label="Page", value=1, precision=0, minimum=1)
+            page_size = gr.Dropdown(label="Rows per page", choices=[25, 50, 100], value=DRILL_ROWS)
+        with gr.Row():
+            prev_btn = gr.Button("◀ Previous")
+            find_btn = gr.Button("Find rows", variant="primary")
+            next_btn = gr.Button("Next ▶")
+        rows_output = gr.HTML()
+    
+    inputs = [file_input, column_input, taxonomy_input, result_state, category, keywords, mode, page, page_size]
+    outputs = [rows_output, page]
+    
+    def first_page(*args):
+        return drill_down(*args[:-2], 1, args[-1])
+    
+    find_btn.click(first_page, inputs=inputs, outputs=outputs)
+    prev_btn.click(lambda *a: drill_down(*a[:-2], (a[-2] or 1) - 1, a[-1]), inputs=inputs, outputs=outputs)
+    next_btn.click(lambda *a: drill_down(*a[:-2], (a[-2] or 1) + 1, a[-1]), inputs=inputs, outputs=outputs)
+    table.select(select_keyword, inputs=[table], outputs=[category, keywords]).then(
+        first_page, inputs=inputs, outputs=outputs
+    )
+    return table, category
+
+
+def render_diagnostics(limit=20):
+    """Stage timings of the most recent runs as an HTML table, plus the raw records."""
+    runs = get_recent_runs()[:limit]
+    if not runs:
+        return "<p>No analyses recorded yet.</p>", []
+    
+    parts = [REPORT_CSS, """
+    <div class="kw-report">
+        <table class="detail">
+            <tr><th>Time</th><th>Run</th><th>Stage</th><th class="num">Wall (s)</th><th class="num">CPU (s)</th>
+            <th class="num">Peak traced (MB)</th><th class="num">Max RSS (MB)</th><th>Counts</th></tr>
+    """]
+    skip = ('stage', 'wall_s', 'cpu_s', 'peak_traced_mb', 'max_rss_mb')
+    for run in runs:
+        label = escape(f"{run['run']} {run.get('file', '')} {run.get('column', '')}".strip())
+        for stage in run['stages']:
+            counts = ', '.join(f"{k}={v}" for k, v in stage.items() if k not in skip)
+            parts.append(
+                f"<tr><td>{run['timestamp']}</td><td>{label}</td><td>{escape(stage['stage'])}</td>"
+                f"<td class=\"num\">{stage['wall_s']:.3f}</td><td class=\"num\">{stage['cpu_s']:.3f}</td>"
+                f"<td class=\"num\">{stage.get('peak_traced_mb', '-')}</td>"
+                f"<td class=\"num\">{stage['max_rss_mb'] or '-'}</td><td>{escape(counts)}</td></tr>"
+            )
+        parts.append(
+            f"<tr class=\"other\"><td>{run['timestamp']}</td><td>{label}</td><td class=\"cat\">total</td>"
+            f"<td class=\"num\">{run['wall_s']:.3f}</td><td class=\"num\">{run['cpu_s']:.3f}</td>"
+            f"<td class=\"num\">-</td><td class=\"num\">{run['max_rss_mb'] or '-'}</td>"
+            f"<td>{escape('error=' + run['error']) if run.get('error') else ''}</td></tr>"
+        )
+    parts.append("</table></div>")
+    return "".join(parts), runs
 
 
 def quick_ecommerce():
-    return analyze_keywords(
+    yield from analyze_keywords(
         "C:\\Users\\kritika.maheshwari\\Documents\\VSCode\\eCOMMERCE_1.xlsx",
         "Prerequisites"
     )
 
 
 def quick_book1():
-    return analyze_keywords(
+    yield from analyze_keywords(
         "C:\\Users\\kritika.maheshwari\\OneDrive - Accenture\\Book1.xlsx",
         "Prerequisites"
     )
 
 
 if __name__ == "__main__":
+    import gradio as gr
+    
     with gr.Blocks() as demo:
         gr.Markdown("""
         # 📊 eCOMMERCE Excel Analysis Platform
@@ -215,13 +804,43 @@ if __name__ == "__main__":
                     )
                     read_btn = gr.Button("📖 Read File", variant="primary")
                 
+                with gr.Row():
+                    preview_columns = gr.Textbox(
+                        label="📋 Columns (optional)",
+                        placeholder="Comma-separated, e.g., Test Case ID, Prerequisites (default: all)"
+                    )
+                    preview_page = gr.Number(label="Page", value=1, precision=0, minimum=1)
+                    preview_size = gr.Dropdown(label="Rows per page", choices=[10, 25, 50, 100], value=PREVIEW_ROWS)
+                
+                with gr.Row():
+                    prev_page_btn = gr.Button("◀ Previous")
+                    next_page_btn = gr.Button("Next ▶")
+                    export_btn = gr.Button("💾 Export CSV")
+                
                 file_output = gr.HTML(label="File Preview")
-                csv_output = gr.Textbox(label="Raw CSV Data", lines=10, interactive=False)
+                csv_output = gr.File(label="CSV Export")
                 
+                preview_inputs = [file_input, preview_page, preview_size, preview_columns]
+                preview_outputs = [file_output, preview_page]
                 read_btn.click(
-                    read_excel_file,
-                    inputs=[file_input],
-                    outputs=[file_output, csv_output]
+                    preview_first_page,
+                    inputs=preview_inputs,
+                    outputs=preview_outputs
+                )
+                prev_page_btn.click(
+                    preview_previous_page,
+                    inputs=preview_inputs,
+                    outputs=preview_outputs
+                )
+                next_page_btn.click(
+                    preview_next_page,
+                    inputs=preview_inputs,
+                    outputs=preview_outputs
+                )
+                export_btn.click(
+                    export_excel_csv,
+                    inputs=[file_input, preview_columns],
+                    outputs=[csv_output]
                 )
             
             # Tab 2: Keyword Analysis
@@ -237,13 +856,32 @@ if __name__ == "__main__":
                         )
                     with gr.Column(scale=2):
                         column_name = gr.Textbox(
-                            label="📋 Column Name",
-                            placeholder="e.g., Prerequisites, Description, Features"
+                            label="📋 Column Name(s)",
+                            placeholder="e.g., Prerequisites — or Prerequisites, Description, Steps — or all"
                         )
                 
+                taxonomy_file = gr.Textbox(
+                    label="🗂️ Taxonomy File (optional)",
+                    placeholder="YAML/JSON with stop_words and categories; defaults to taxonomy.yaml"
+                )
+                
+                with gr.Row():
+                    stream_mode = gr.Checkbox(
+                        label="🌊 Streaming mode (read only this column, row by row — for very large sheets)",
+                        value=False
+                    )
+                    approx_keywords = gr.Number(
+                        label="≈ Approximate: track at most N keywords (0 = exact counts)",
+                        value=0, precision=0, minimum=0
+                    )
+                
                 analyze_btn = gr.Button("🚀 Analyze Keywords", variant="primary")
                 
                 analysis_output = gr.HTML(label="Analysis Results")
+                analysis_result = gr.State()
+                analysis_category = keyword_browser(analysis_result)
+                drill_table, drill_category = row_drill_down(analysis_result, analysis_file, column_name,
+                                                             taxonomy_file)
                 
                 # Example files info
                 gr.Markdown("""
@@ -254,8 +892,10 @@ if __name__ == "__main__":
                 
                 analyze_btn.click(
                     analyze_keywords,
-                    inputs=[analysis_file, column_name],
-                    outputs=[analysis_output]
+                    inputs=[analysis_file, column_name, stream_mode, taxonomy_file, approx_keywords],
+                    outputs=[analysis_output, analysis_result]
+                ).then(category_choices, inputs=[analysis_result], outputs=[analysis_category]).then(
+                    drill_down_choices, inputs=[analysis_result], outputs=[drill_table, drill_category]
                 )
             
             # Tab 3: Pre-configured Analysis
@@ -267,11 +907,27 @@ if __name__ == "__main__":
                     book1_btn = gr.Button("📕 Book1.xlsx Analysis", variant="primary")
                 
                 quick_output = gr.HTML(label="Quick Analysis Results")
+                quick_result = gr.State()
+                quick_category = keyword_browser(quick_result)
+                
+                ecom_btn.click(quick_ecommerce, outputs=[quick_output, quick_result]).then(
+                    category_choices, inputs=[quick_result], outputs=[quick_category]
+                )
+                book1_btn.click(quick_book1, outputs=[quick_output, quick_result]).then(
+                    category_choices, inputs=[quick_result], outputs=[quick_category]
+                )
+            
+            # Tab 4: Diagnostics
+            with gr.Tab("🩺 Diagnostics"):
+                gr.Markdown("### Per-stage timing and memory of recent analyses")
+                
+                refresh_btn = gr.Button("🔄 Refresh", variant="primary")
+                diagnostics_output = gr.HTML()
+                diagnostics_json = gr.JSON(label="Raw records")
                 
-                ecom_btn.click(quick_ecommerce, outputs=[quick_output])
-                book1_btn.click(quick_book1, outputs=[quick_output])
+                refresh_btn.click(render_diagnostics, outputs=[diagnostics_output, diagnostics_json])
             
-            # Tab 4: Help & Documentation
+            # Tab 5: Help & Documentation
             with gr.Tab("📚 Help & Documentation"):
                 gr.Markdown("""
                 ## How to Use This Application
@@ -279,24 +935,36 @@ if __name__ == "__main__":
                 ### 1️⃣ Read Excel File Tab
                 - Enter the full path to your Excel file
                 - Click "Read File" to preview the contents
-                - View column names and sample data
+                - View column names and sample data, page by page
+                - Optionally limit the preview to selected columns
+                - Click "Export CSV" to download the sheet as a CSV file
                 
                 ### 2️⃣ Keyword Analysis Tab
                 - Provide the Excel file path
-                - Specify the column name to analyze (case-insensitive)
+                - Specify the column name to analyze (case-insensitive); list several
+                  columns separated by commas, or enter `all` for every text column,
+                  to analyze them in one read with per-column and combined results
                 - The system will:
                   - Extract all keywords from the specified column
                   - Categorize them (User/Account, Product, Order, etc.)
                   - Calculate occurrence frequencies
                   - Generate a comprehensive summary table
+                - Open "Drill down to rows" and click a keyword or category (or enter
+                  keywords with AND/OR) to list the matching rows with their Excel row numbers
                 
                 ### 3️⃣ Pre-configured Analysis
                 - Click buttons to quickly analyze known files
                 - No file path entry needed
                 
+                ### 4️⃣ Diagnostics
+                - Wall time, CPU time and memory of each stage (reading, tokenizing,
+                  categorizing, rendering) of the most recent analyses
+                - Set `KEYWORD_PROFILE_TRACEMALLOC=1` to also trace Python memory per stage
+                
                 ### 📊 Output Features
                 - **Category Summary**: Shows keyword count and percentage per category
-                - **Detailed Breakdown**: Lists all keywords with individual counts
+                - **Detailed Breakdown**: Lists the top keywords of each category with individual counts
+                - **Browse all keywords**: Pages through every keyword of a category on demand
                 - **Filtering**: Common words automatically filtered out
                 - **Categorization**: 8 predefined categories + "Other" for uncategorized keywords
                 
@@ -335,6 +1003,9 @@ if __name__ == "__main__":
     print("=" * 80)
     print()
     
+    # Queue requests so a long analysis does not block other users; handlers stream progress
+    demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT, max_size=MAX_QUEUE_SIZE)
+    
     # Launch with public sharing enabled
     demo.launch(
         server_name="0.0.0.0",
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and memory instrumentation for the keyword analysis pipeline
+
+Every analysis run records wall time, CPU time and memory per stage (load,
+tokenize, categorize, output) plus row, word and keyword counts. Records are
+emitted as one JSON object per line on the "keyword_profile" logger and kept
+in memory for the web UI diagnostics tab.
+
+By default memory is the process peak RSS, which costs nothing to read. With
+tracemalloc enabled (--profile on the command line, KEYWORD_PROFILE_TRACEMALLOC=1
+for the web UI) each stage also reports the peak of Python allocations during
+that stage, at the price of slower allocation-heavy code.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("keyword_profile")
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.NullHandler())
+
+# JSON lines are appended to this file when set
+PROFILE_LOG = os.getenv("KEYWORD_PROFILE_LOG")
+TRACE_MEMORY = os.getenv("KEYWORD_PROFILE_TRACEMALLOC", "") not in ("", "0")
+
+MB = 1024 * 1024
+
+# Recent runs for the web UI diagnostics tab
+recent_runs = deque(maxlen=50)
+_recent_lock = threading.Lock()
+
+
+def log_to(stream_or_path):
+    """Also write the JSON log lines to a stream (e.g. sys.stderr) or a file path."""
+    if isinstance(stream_or_path, (str, os.PathLike)):
+        handler = logging.FileHandler(stream_or_path, encoding='utf-8')
+    else:
+        handler = logging.StreamHandler(stream_or_path)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return handler
+
+
+if PROFILE_LOG:
+    log_to(PROFILE_LOG)
+
+
+def max_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (MB if sys.platform == 'darwin' else 1024), 1)
+
+
+class Profile:
+    """Stage records of one analysis run.
+
+    Use `with profile.stage("tokenize") as stage:` and add counts to the yielded
+    dict; call finish() once at the end. With trace_memory=True tracemalloc is
+    started for the run (if not already tracing) and stopped by finish().
+    Used as a context manager (`with Profile(...) as run:`) the run is finished
+    on every exit, an exception recorded as its error, unless finish() was
+    already called.
+    """
+
+    def __init__(self, name, trace_memory=TRACE_MEMORY, **context):
+        self.name = name
+        self.context = context
+        self.stages = []
+        self.counts = {}
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+        self.timestamp = datetime.now().isoformat(timespec='seconds')
+        self.finished = None
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        record = {'stage': name}
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # Shared by all threads, so concurrent runs see each other's allocations
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            counts = {k: record.pop(k) for k in list(record) if k != 'stage'}
+            record['wall_s'] = round(time.perf_counter() - wall, 6)
+            record['cpu_s'] = round(time.process_time() - cpu, 6)
+            if tracing:
+                record['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / MB, 2)
+            record['max_rss_mb'] = max_rss_mb()
+            record.update(counts)
+            self.counts.update(counts)
+            self.stages.append(record)
+            self._emit({'event': 'stage', **record})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.finished is None:
+            self.finish(**({'error': f"{exc_type.__name__}: {exc}"} if exc_type else {}))
+        return False
+
+    def finish(self, **counts):
+        """Record the run totals and return the run as a dict. Later calls return the same run."""
+        if self.finished is not None:
+            return self.finished
+        self.counts.update(counts)
+        run = {
+            'run': self.name,
+            'timestamp': self.timestamp,
+            **self.context,
+            'wall_s': round(time.perf_counter() - self.started, 6),
+            'cpu_s': round(time.process_time() - self.started_cpu, 6),
+            'max_rss_mb': max_rss_mb(),
+            **self.counts,
+            'stages': self.stages,
+        }
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        self._emit({'event': 'run', **{k: v for k, v in run.items() if k != 'stages'}})
+        with _recent_lock:
+            recent_runs.append(run)
+        self.finished = run
+        return run
+
+    def _emit(self, record):
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({'run': self.name, **record}, default=str))
+
+
+class NullProfile:
+    """Stand-in when the caller does not profile."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def stage(self, name):
+        return nullcontext({})
+
+    def finish(self, **counts):
+        return None
+
+
+NULL_PROFILE = NullProfile()
+
+
+def get_recent_runs():
+    """Most recent runs first."""
+    with _recent_lock:
+        return list(reversed(recent_runs))
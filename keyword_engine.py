@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Keyword analysis engine shared by the CLI and the Gradio UI
+
+Stop words and categories come from a taxonomy file (YAML or JSON), compiled
+once per file version and cached on disk as a pickled artifact.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+
+from instrumentation import NULL_PROFILE
+
+DETAIL_COLUMNS = ['Category', 'Keyword', 'Count', 'Percentage']
+SUMMARY_COLUMNS = ['Category', 'Keywords', 'Total Count', 'Percentage']
+
+# Bump when the compiled taxonomy layout changes, to invalidate cached artifacts
+ENGINE_VERSION = 1
+
+DEFAULT_TAXONOMY_PATH = Path(os.getenv("KEYWORD_TAXONOMY", Path(__file__).with_name("taxonomy.yaml")))
+TAXONOMY_CACHE_DIR = Path(__file__).with_name(".taxonomy_cache")
+
+WORD_PATTERN = re.compile(r'\b[a-zA-Z_]+\b')
+
+# Cells tokenized per batch
+CHUNK_SIZE = 50_000
+
+# Memoized word -> category lookups kept per matcher
+MATCH_CACHE_SIZE = 1_000_000
+
+
+def _tokenize_chunk(strings, counts):
+    """Tokenize one bounded batch of cell strings into counts; returns the token count."""
+    tokens = WORD_PATTERN.findall(' '.join(strings).lower())
+    counts.update(tokens)
+    return len(tokens)
+
+
+def _filter_keywords(counts, common_words):
+    """Drop short tokens and stop words, checking each unique token once."""
+    dropped = {w for w in counts if len(w) <= 2}
+    dropped.update(common_words & counts.keys())
+    for word in dropped:
+        del counts[word]
+    return counts
+
+
+def count_keywords(text_data, common_words, chunk_size=CHUNK_SIZE):
+    """Count keywords in a Series of cell values (NaN already dropped).
+
+    Cells are converted with a vectorized astype(str) and tokenized in
+    fixed-size batches, so no intermediate string or word list grows with
+    the column. Filtering runs over unique tokens only. Returns (word_freq,
+    total_words), identical to tokenizing ' '.join(str(v) for v in text_data)
+    in one pass, including the first-occurrence order of word_freq.
+    """
+    counts = Counter()
+    total_words = 0
+
+    for start in range(0, len(text_data), chunk_size):
+        chunk = text_data.iloc[start:start + chunk_size].astype(str)
+        total_words += _tokenize_chunk(chunk, counts)
+
+    return _filter_keywords(counts, common_words), total_words
+
+
+def count_keywords_stream(values, common_words, chunk_size=CHUNK_SIZE):
+    """Tokenize an iterable of cell values in bounded batches.
+
+    Returns (word_freq, total_words, records). The counts match tokenizing
+    ' '.join(values) in one pass, since the space separator is a word boundary.
+    """
+    counts = Counter()
+    total_words = 0
+    records = 0
+
+    values = iter(values)
+    while True:
+        chunk = [str(v) for v in islice(values, chunk_size)]
+        if not chunk:
+            break
+        records += len(chunk)
+        total_words += _tokenize_chunk(chunk, counts)
+
+    return _filter_keywords(counts, common_words), total_words, records
+
+
+def count_keywords_rows(rows, width, common_words, chunk_size=CHUNK_SIZE):
+    """Tokenize width columns of an iterable of row tuples in one pass over the rows.
+
+    Missing cells are None. Returns, per column, (word_freq, total_words,
+    records, text): the counts match count_keywords_stream over that column's
+    cells, and text tells whether any of them was a string.
+    """
+    buffers = [[] for _ in range(width)]
+    counts = [Counter() for _ in range(width)]
+    total_words = [0] * width
+    records = [0] * width
+    text = [False] * width
+
+    def flush(i):
+        records[i] += len(buffers[i])
+        total_words[i] += _tokenize_chunk(buffers[i], counts[i])
+        buffers[i] = []
+
+    for row in rows:
+        for i, value in enumerate(row):
+            if value is None:
+                continue
+            if isinstance(value, str):
+                text[i] = True
+            buffers[i].append(str(value))
+            if len(buffers[i]) >= chunk_size:
+                flush(i)
+
+    for i in range(width):
+        if buffers[i]:
+            flush(i)
+    return [
+        (_filter_keywords(counts[i], common_words), total_words[i], records[i], text[i])
+        for i in range(width)
+    ]
+
+
+class SpaceSaving:
+    """Bounded heavy-hitters sketch (mergeable Space-Saving) over keyword counts.
+
+    At most capacity keywords are tracked. Every tracked count overestimates
+    the true count by at most its error (true count is in [count - error,
+    count]), and no untracked keyword occurred more than floor times. While
+    fewer than capacity distinct keywords are seen, counts are exact.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(int(capacity), 1)
+        self.counts = {}
+        self.errors = {}
+        self.floor = 0
+
+    def update(self, counts, errors=None, floor=0):
+        """Add exact counts, or another sketch's (counts, errors, floor)."""
+        if floor:
+            # Keywords the other side did not track may have occurred up to its floor times
+            for word in self.counts.keys() - counts.keys():
+                self.counts[word] += floor
+                self.errors[word] += floor
+        for word, count in counts.items():
+            error = errors[word] if errors else 0
+            if word in self.counts:
+                self.counts[word] += count
+                self.errors[word] += error
+            else:
+                self.counts[word] = self.floor + count
+                self.errors[word] = self.floor + error
+        self.floor += floor
+        if len(self.counts) > self.capacity:
+            self._prune()
+
+    def merge(self, other):
+        self.update(other.counts, other.errors, other.floor)
+
+    def _prune(self):
+        ranked = sorted(self.counts, key=self.counts.__getitem__, reverse=True)
+        for word in ranked[self.capacity:]:
+            self.floor = max(self.floor, self.counts.pop(word))
+            del self.errors[word]
+
+    def guaranteed(self, word):
+        """True if word is certainly more frequent than any untracked keyword."""
+        return self.counts[word] - self.errors[word] > self.floor
+
+
+def count_keywords_approx(values, common_words, capacity, chunk_size=CHUNK_SIZE):
+    """Count keywords of an iterable of cell values into a SpaceSaving sketch.
+
+    Memory is bounded by capacity tracked keywords plus one batch. Returns
+    (sketch, total_words, records); total_words and records are exact.
+    """
+    sketch = SpaceSaving(capacity)
+    total_words = 0
+    records = 0
+
+    values = iter(values)
+    while True:
+        chunk = [str(v) for v in islice(values, chunk_size)]
+        if not chunk:
+            break
+        records += len(chunk)
+        counts = Counter()
+        total_words += _tokenize_chunk(chunk, counts)
+        sketch.update(_filter_keywords(counts, common_words))
+
+    return sketch, total_words, records
+
+
+class CategoryMatcher:
+    """Aho-Corasick index over the keywords of an ordered categories dict.
+
+    match(word) returns the first category (in dict order) having a keyword
+    that occurs as a substring of word, or None, exactly like
+    `for category, keywords in categories.items(): if any(kw in word for kw in keywords)`.
+    The automaton is built once; each lookup is a single pass over the word
+    and results are memoized.
+    """
+
+    def __init__(self, categories):
+        self.names = list(categories)
+
+        # Trie: goto transitions per node and the best (lowest) category index ending there
+        self._goto = [{}]
+        self._best = [None]
+        for index, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                node = 0
+                for char in keyword:
+                    nxt = self._goto[node].get(char)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][char] = nxt
+                        self._goto.append({})
+                        self._best.append(None)
+                    node = nxt
+                if self._best[node] is None or index < self._best[node]:
+                    self._best[node] = index
+
+        # Failure links (BFS); each node inherits the best match of its suffix chain
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            fallback = self._best[self._fail[node]]
+            if fallback is not None and (self._best[node] is None or fallback < self._best[node]):
+                self._best[node] = fallback
+            for char, child in self._goto[node].items():
+                state = self._fail[node]
+                while state and char not in self._goto[state]:
+                    state = self._fail[state]
+                self._fail[child] = self._goto[state].get(char, 0)
+                queue.append(child)
+
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['match']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+
+    def _match(self, word):
+        goto, fail, best = self._goto, self._fail, self._best
+        found = best[0]
+        node = 0
+        for char in word:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            index = best[node]
+            if index is not None and (found is None or index < found):
+                found = index
+                if found == 0:
+                    break
+        return None if found is None else self.names[found]
+
+
+def categorize_keywords(word_freq, matcher):
+    """Group word_freq into {category: {'keywords': [...], 'counts': [...]}}.
+
+    Words matching no category are collected under 'Other'. Category order
+    follows first appearance; consumers sort by name.
+    """
+    categorized = defaultdict(lambda: {'keywords': [], 'counts': []})
+    uncategorized = []
+
+    for word, count in word_freq.items():
+        category = matcher.match(word)
+        if category is None:
+            uncategorized.append((word, count))
+        else:
+            categorized[category]['keywords'].append(word)
+            categorized[category]['counts'].append(count)
+
+    if uncategorized:
+        categorized['Other'] = {
+            'keywords': [w[0] for w in uncategorized],
+            'counts': [w[1] for w in uncategorized]
+        }
+
+    return dict(categorized)
+
+
+class Taxonomy:
+    """Stop words and categories loaded from a taxonomy file, with a compiled matcher."""
+
+    def __init__(self, name, stop_words, categories, version):
+        self.name = name
+        self.stop_words = frozenset(stop_words)
+        self.categories = categories
+        self.version = version
+        self.matcher = CategoryMatcher(categories)
+
+
+def _parse_taxonomy(path, raw):
+    """Return (name, stop_words, categories) from taxonomy file contents."""
+    if path.suffix.lower() == '.json':
+        data = json.loads(raw)
+    else:
+        import yaml  # deferred: compiled taxonomies are normally loaded from the pickle cache
+        data = yaml.safe_load(raw) or {}
+
+    stop_words = data.get('stop_words') or []
+    categories = data.get('categories') or {}
+    # YAML 1.1 reads bare no/on/yes as booleans; insist on strings everywhere
+    terms = list(categories) + list(stop_words) + [kw for kws in categories.values() for kw in kws]
+    bad = [t for t in terms if not isinstance(t, str)]
+    if bad:
+        raise ValueError(f"Taxonomy {path} has non-string terms {bad}; quote them in the file")
+
+    return data.get('name', path.stem), stop_words, categories
+
+
+_taxonomies = {}
+_taxonomy_lock = threading.Lock()
+
+
+def load_taxonomy(path=None):
+    """Load and compile a taxonomy file, once per file version.
+
+    The compiled Taxonomy is kept in memory and pickled to TAXONOMY_CACHE_DIR
+    under a hash of the file contents and ENGINE_VERSION, so later processes
+    skip compilation.
+    """
+    path = Path(path or DEFAULT_TAXONOMY_PATH).resolve()
+    with open(path, 'rb') as f:
+        raw = f.read()
+    version = hashlib.sha256(raw + f"engine-{ENGINE_VERSION}".encode()).hexdigest()[:16]
+
+    with _taxonomy_lock:
+        taxonomy = _taxonomies.get(path)
+        if taxonomy is not None and taxonomy.version == version:
+            return taxonomy
+
+        artifact = TAXONOMY_CACHE_DIR / f"{path.stem}-{version}.pickle"
+        taxonomy = None
+        if artifact.exists():
+            try:
+                with open(artifact, 'rb') as f:
+                    taxonomy = pickle.load(f)
+            except Exception:
+                taxonomy = None
+
+        if taxonomy is None:
+            name, stop_words, categories = _parse_taxonomy(path, raw)
+            taxonomy = Taxonomy(name, stop_words, categories, version)
+            try:
+                TAXONOMY_CACHE_DIR.mkdir(exist_ok=True)
+                tmp = artifact.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp, 'wb') as f:
+                    pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, artifact)
+            except OSError:
+                pass  # read-only checkout: compile in memory only
+
+        _taxonomies[path] = taxonomy
+        return taxonomy
+
+
+@dataclass
+class KeywordAnalysis:
+    """Result of analyzing one text column, consumed by the console, CSV and HTML reports.
+
+    sketch is set for approximate results; word_freq then holds its estimates.
+    """
+
+    column: str
+    records: int
+    total_words: int
+    word_freq: Counter
+    categorized: dict
+    taxonomy: str = 'ecommerce'
+    sketch: SpaceSaving = None
+    _sorted: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def unique_keywords(self):
+        return len(self.word_freq)
+
+    def percentage(self, count, total=None):
+        """Format count as a percentage of all word occurrences (or of total)."""
+        total = self.total_words if total is None else total
+        return f"{(count/total*100 if total else 0.0):.1f}%"
+
+    def categories(self):
+        """Category names in report order (alphabetical)."""
+        return sorted(self.categorized.keys())
+
+    def category_keywords(self, category):
+        """(keyword, count) pairs of one category, most frequent first.
+
+        Sorted once per category and reused (e.g. when paging through the UI);
+        the returned list must not be modified.
+        """
+        pairs = self._sorted.get(category)
+        if pairs is None:
+            entry = self.categorized[category]
+            pairs = sorted(zip(entry['keywords'], entry['counts']), key=lambda x: x[1], reverse=True)
+            self._sorted[category] = pairs
+        return pairs
+
+    def category_total(self, category):
+        return sum(self.categorized[category]['counts'])
+
+    @property
+    def approximate(self):
+        return self.sketch is not None
+
+    def category_error(self, category):
+        """Upper bound on how much category_total overcounts its tracked keywords (0 when exact)."""
+        if self.sketch is None:
+            return 0
+        return sum(self.sketch.errors.get(keyword, 0) for keyword in self.categorized[category]['keywords'])
+
+    def summary_rows(self):
+        """Rows of the category summary table / CSV."""
+        rows = []
+        for category in self.categories():
+            total_count = self.category_total(category)
+            rows.append({
+                'Category': category,
+                'Keywords': len(self.categorized[category]['keywords']),
+                'Total Count': total_count,
+                'Percentage': self.percentage(total_count)
+            })
+        return rows
+
+    def detail_rows(self):
+        """Rows of the detailed keyword table / CSV, by category then count."""
+        rows = []
+        for category in self.categories():
+            for keyword, count in self.category_keywords(category):
+                rows.append({
+                    'Category': category,
+                    'Keyword': keyword,
+                    'Count': count,
+                    'Percentage': self.percentage(count)
+                })
+        return rows
+
+
+def analyze_text(text_data, column, taxonomy=None, profile=NULL_PROFILE):
+    """Analyze a Series of cell values (NaN already dropped).
+
+    The tokenize and categorize stages are recorded on profile (see instrumentation).
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    with profile.stage('tokenize') as stage:
+        word_freq, total_words = count_keywords(text_data, taxonomy.stop_words)
+        stage.update(rows=len(text_data), words=total_words, keywords=len(word_freq))
+    with profile.stage('categorize') as stage:
+        categorized = categorize_keywords(word_freq, taxonomy.matcher)
+        stage.update(categories=len(categorized))
+    return KeywordAnalysis(column, len(text_data), total_words, word_freq, categorized, taxonomy.name)
+
+
+def analyze_stream(values, column, taxonomy=None, profile=NULL_PROFILE):
+    """Analyze an iterable of non-empty cell values (e.g. an excel_stream.ColumnStream).
+
+    Reading a stream happens while tokenizing, so both are one 'stream_tokenize' stage.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    with profile.stage('stream_tokenize') as stage:
+        word_freq, total_words, records = count_keywords_stream(values, taxonomy.stop_words)
+        stage.update(rows=records, words=total_words, keywords=len(word_freq))
+    with profile.stage('categorize') as stage:
+        categorized = categorize_keywords(word_freq, taxonomy.matcher)
+        stage.update(categories=len(categorized))
+    return KeywordAnalysis(column, records, total_words, word_freq, categorized, taxonomy.name)
+
+
+def analyze_approx(values, column, capacity, taxonomy=None, profile=NULL_PROFILE):
+    """Analyze an iterable of non-empty cell values, tracking at most capacity keywords.
+
+    Counts are SpaceSaving estimates (see KeywordAnalysis.sketch for the error bounds).
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    with profile.stage('approx_tokenize') as stage:
+        sketch, total_words, records = count_keywords_approx(values, taxonomy.stop_words, capacity)
+        stage.update(rows=records, words=total_words, keywords=len(sketch.counts), max_error=sketch.floor)
+    word_freq = Counter(sketch.counts)
+    with profile.stage('categorize') as stage:
+        categorized = categorize_keywords(word_freq, taxonomy.matcher)
+        stage.update(categories=len(categorized))
+    return KeywordAnalysis(column, records, total_words, word_freq, categorized, taxonomy.name, sketch)
+
+
+def analyze_columns(rows, columns, taxonomy=None, profile=NULL_PROFILE, text_only=False):
+    """Analyze several columns of an iterable of row tuples (e.g. ColumnStream.iter_columns) in one pass.
+
+    Returns (results, combined): a KeywordAnalysis per column, in order, and
+    their merge labelled 'A + B'. With text_only, columns holding no strings
+    are left out.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    with profile.stage('multi_tokenize') as stage:
+        counted = count_keywords_rows(rows, len(columns), taxonomy.stop_words)
+        if text_only:
+            kept = [i for i, c in enumerate(counted) if c[3]]
+            columns = [columns[i] for i in kept]
+            counted = [counted[i] for i in kept]
+        stage.update(columns=len(columns), cells=sum(c[2] for c in counted),
+                     words=sum(c[1] for c in counted), keywords=sum(len(c[0]) for c in counted))
+    with profile.stage('categorize') as stage:
+        results, combined = categorize_columns(columns, counted, taxonomy)
+        stage.update(categories=len(combined.categorized))
+    return results, combined
+
+
+def categorize_columns(columns, counted, taxonomy=None):
+    """Turn per-column (word_freq, total_words, records, ...) counts into (results, combined) analyses."""
+    taxonomy = taxonomy or load_taxonomy()
+    results = [
+        KeywordAnalysis(column, records, total_words, word_freq,
+                        categorize_keywords(word_freq, taxonomy.matcher), taxonomy.name)
+        for column, (word_freq, total_words, records, *_) in zip(columns, counted)
+    ]
+    return results, merge_analyses(results, ' + '.join(columns), taxonomy)
+
+
+def text_columns(frame):
+    """Columns of a DataFrame holding at least one string cell."""
+    return [col for col in frame.columns if frame[col].map(lambda v: isinstance(v, str)).any()]
+
+
+def merge_analyses(results, column, taxonomy=None):
+    """Combine per-sheet results into one KeywordAnalysis by summing their counters.
+
+    If any result is approximate, the results are merged as SpaceSaving sketches
+    with the largest capacity among them.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    word_freq = Counter()
+    records = 0
+    total_words = 0
+    capacities = [result.sketch.capacity for result in results if result.sketch is not None]
+    sketch = SpaceSaving(max(capacities)) if capacities else None
+    for result in results:
+        if sketch is not None:
+            if result.sketch is not None:
+                sketch.merge(result.sketch)
+            else:
+                sketch.update(result.word_freq)
+        else:
+            word_freq.update(result.word_freq)
+        records += result.records
+        total_words += result.total_words
+    if sketch is not None:
+        word_freq = Counter(sketch.counts)
+    categorized = categorize_keywords(word_freq, taxonomy.matcher)
+    return KeywordAnalysis(column, records, total_words, word_freq, categorized, taxonomy.name, sketch)
+
+
+def write_csv(path, rows, columns):
+    """Write dict rows to CSV in the same format as DataFrame.to_csv(index=False)."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator=os.linesep)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# Compile the default taxonomy at import so requests pay no setup cost
+DEFAULT_TAXONOMY = load_taxonomy()
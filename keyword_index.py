@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Inverted keyword -> row index for drilling down from an analysis to its rows
+
+Row ids are 0-based positions in the sheet. Postings are kept CSR-style: one
+sorted uint32 array of row ids for all keywords plus an offsets array, so a
+million-row column costs a few bytes per (keyword, row) pair instead of a
+Python int each.
+"""
+
+from array import array
+
+import numpy as np
+
+from keyword_engine import WORD_PATTERN
+
+EMPTY_ROWS = np.empty(0, dtype=np.uint32)
+
+
+class KeywordIndex:
+    """Rows containing each keyword of one column, with AND/OR queries.
+
+    records counts the indexed (non-empty) cells; it is None for an index
+    combining several columns.
+    """
+
+    def __init__(self, keywords, offsets, rows, records):
+        self.keywords = keywords
+        self._slot = {keyword: i for i, keyword in enumerate(keywords)}
+        self.offsets = offsets
+        self.row_ids = rows
+        self.records = records
+
+    @property
+    def nbytes(self):
+        # Array data only; the keyword dict is about the size of the analysis' own word_freq
+        return int(self.offsets.nbytes + self.row_ids.nbytes)
+
+    def __contains__(self, keyword):
+        return keyword in self._slot
+
+    def rows(self, keyword):
+        """Sorted row ids containing keyword (a read-only view; empty when unknown)."""
+        slot = self._slot.get(keyword.lower())
+        if slot is None:
+            return EMPTY_ROWS
+        return self.row_ids[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def query(self, keywords, mode='or'):
+        """Sorted row ids containing any ('or') or all ('and') of keywords."""
+        postings = [self.rows(keyword) for keyword in keywords]
+        if not postings:
+            return EMPTY_ROWS
+        if mode == 'and':
+            # Intersect smallest first so every step is bounded by the rarest keyword
+            postings.sort(key=len)
+            found = postings[0]
+            for rows in postings[1:]:
+                if not len(found):
+                    break
+                found = np.intersect1d(found, rows, assume_unique=True)
+            return found
+        if mode != 'or':
+            raise ValueError(f"Unknown query mode '{mode}' (use 'and' or 'or')")
+        return np.unique(np.concatenate(postings))
+
+    def category_rows(self, result, category):
+        """Sorted row ids containing any keyword of a category of a KeywordAnalysis."""
+        return self.query(result.categorized[category]['keywords'], 'or')
+
+
+def build_index(values, common_words):
+    """Index an iterable of (row_id, cell value) pairs; empty cells may be skipped.
+
+    Keywords are the analysis' (3+ letters, not a stop word), so every keyword
+    of a KeywordAnalysis of the same column and taxonomy is in the index.
+    """
+    postings = {}
+    skipped = set()
+    records = 0
+    for row_id, value in values:
+        records += 1
+        for word in set(WORD_PATTERN.findall(str(value).lower())):
+            rows = postings.get(word)
+            if rows is None:
+                if word in skipped:
+                    continue
+                if len(word) <= 2 or word in common_words:
+                    skipped.add(word)
+                    continue
+                rows = postings[word] = array('I')
+            rows.append(row_id)
+
+    keywords = list(postings)
+    offsets = np.zeros(len(keywords) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(postings[keyword]) for keyword in keywords])
+    rows = np.empty(int(offsets[-1]), dtype=np.uint32)
+    for i, keyword in enumerate(keywords):
+        # Rows are visited in order, so each posting is already sorted
+        rows[offsets[i]:offsets[i + 1]] = np.frombuffer(postings.pop(keyword), dtype=np.uint32)
+    rows.flags.writeable = False
+    return KeywordIndex(keywords, offsets, rows, records)
+
+
+def combine_indexes(indexes):
+    """One KeywordIndex over several columns of a sheet: a row has a keyword if any of the columns does."""
+    keywords = list(dict.fromkeys(keyword for index in indexes for keyword in index.keywords))
+    postings = [
+        np.unique(np.concatenate([index.rows(keyword) for index in indexes])).astype(np.uint32)
+        for keyword in keywords
+    ]
+    offsets = np.zeros(len(keywords) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(rows) for rows in postings])
+    rows = np.concatenate(postings) if postings else EMPTY_ROWS.copy()
+    rows.flags.writeable = False
+    return KeywordIndex(keywords, offsets, rows, None)
+
+
+def index_series(series, common_words):
+    """Index a column Series by sheet position, skipping empty cells."""
+    present = series.notna().to_numpy()
+    return build_index(
+        ((i, value) for i, (value, keep) in enumerate(zip(series.to_numpy(), present)) if keep),
+        common_words,
+    )
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Incremental keyword analysis using per-row token-count snapshots
+
+A snapshot is stored per (file, sheet, column) next to the output CSVs. It
+holds a content hash and the keyword counts of every distinct row, plus the
+column totals. On the next run only rows whose hash is new are tokenized;
+counts of rows that disappeared are subtracted from the stored totals.
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+from keyword_engine import WORD_PATTERN, KeywordAnalysis, categorize_keywords, load_taxonomy
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(snapshot_dir, file_path, sheet_name, column):
+    """Snapshot file for one (file, sheet, column) in snapshot_dir."""
+    key = f"{os.path.abspath(file_path)}\0{sheet_name}\0{column}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    return Path(snapshot_dir) / f".{Path(file_path).stem}.keywords-{digest}.json"
+
+
+def _row_hash(text):
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+
+
+def _tokenize_row(text, stop_words):
+    """Return (total_words, {keyword: count}) for one cell."""
+    words = WORD_PATTERN.findall(text.lower())
+    counts = Counter(w for w in words if len(w) > 2 and w not in stop_words)
+    return len(words), dict(counts)
+
+
+def _load_snapshot(path, taxonomy):
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Stop words decide what is counted; a different taxonomy means a full pass
+    if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('taxonomy') != taxonomy.version:
+        return None
+    return snapshot
+
+
+def analyze_incremental(values, file_path, sheet_name, column, snapshot_dir='.', taxonomy=None):
+    """Analyze a column's non-empty cell values, reusing the stored snapshot.
+
+    Returns (KeywordAnalysis, stats) where stats counts the added, removed and
+    re-tokenized rows. Rows are matched by content, so moving rows around costs
+    nothing. Keywords whose counts tie may be listed in a different order
+    than after a fresh full run.
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    path = snapshot_path(snapshot_dir, file_path, sheet_name, column)
+
+    # Current rows, grouped by content hash
+    current = Counter()
+    texts = {}
+    for value in values:
+        text = str(value)
+        row_hash = _row_hash(text)
+        current[row_hash] += 1
+        texts.setdefault(row_hash, text)
+
+    snapshot = _load_snapshot(path, taxonomy)
+    if snapshot is None:
+        snapshot = {'records': 0, 'total_words': 0, 'word_freq': {}, 'rows': {}}
+    rows = snapshot['rows']
+    word_freq = Counter(snapshot['word_freq'])
+    total_words = snapshot['total_words']
+    stats = {'added': 0, 'removed': 0, 'tokenized': 0, 'unchanged': 0}
+
+    # Current rows in sheet order, then rows that disappeared, so new keywords are
+    # appended in first-occurrence order (a first run matches a full pass exactly)
+    for row_hash in list(texts) + [h for h in rows if h not in current]:
+        old_count = rows[row_hash][0] if row_hash in rows else 0
+        delta = current[row_hash] - old_count
+        if delta == 0:
+            stats['unchanged'] += old_count
+            continue
+
+        if row_hash in rows:
+            row_words, row_counts = rows[row_hash][1], rows[row_hash][2]
+        else:
+            row_words, row_counts = _tokenize_row(texts[row_hash], taxonomy.stop_words)
+            stats['tokenized'] += 1
+
+        total_words += delta * row_words
+        for word, count in row_counts.items():
+            word_freq[word] += delta * count
+
+        if delta > 0:
+            stats['added'] += delta
+            stats['unchanged'] += old_count
+        else:
+            stats['removed'] += -delta
+            stats['unchanged'] += current[row_hash]
+
+        if current[row_hash]:
+            rows[row_hash] = [current[row_hash], row_words, row_counts]
+        else:
+            del rows[row_hash]
+
+    word_freq = Counter({w: c for w, c in word_freq.items() if c > 0})
+    records = sum(current.values())
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'file': os.path.abspath(file_path),
+        'sheet': sheet_name,
+        'column': column,
+        'taxonomy': taxonomy.version,
+        'records': records,
+        'total_words': total_words,
+        'word_freq': word_freq,
+        'rows': rows,
+    }
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+    categorized = categorize_keywords(word_freq, taxonomy.matcher)
+    result = KeywordAnalysis(column, records, total_words, word_freq, categorized, taxonomy.name)
+    return result, stats
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+TTL response cache for Distiller queries
+
+Wraps a connected Distiller session so repeated questions are answered from a
+cache keyed by the normalized query text, project and config hash. Hits replay
+the stored response chunks through the same `async for` interface.
+
+Each entry lives for the shortest TTL among the agents that answered it (the
+"role" of the response chunks), so time-sensitive agents expire quickly.
+Backends: in-memory LRU or an on-disk SQLite file, both bounded in entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import yaml
+
+logger = logging.getLogger("query_cache")
+
+DEFAULT_TTL = float(os.getenv("QUERY_CACHE_TTL", "3600"))
+MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1000"))
+
+# Seconds an answer from each agent stays valid; time answers go stale fast.
+# Override or extend with QUERY_CACHE_AGENT_TTLS='{"Agent Name": seconds}'.
+AGENT_TTLS = {"Time Server Agent": 30}
+AGENT_TTLS.update(json.loads(os.getenv("QUERY_CACHE_AGENT_TTLS", "{}")))
+
+
+def normalize_query(text):
+    """Lower-case, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", text).strip().lower().rstrip("?!. ")
+
+
+def config_agents(config_path):
+    """Agent names listed in the orchestrator section of a Distiller config."""
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    return [agent["agent_name"] for agent in (config.get("orchestrator") or {}).get("agent_list") or []]
+
+
+def agent_ttl(agents, agent_ttls=None, default_ttl=DEFAULT_TTL):
+    """Shortest TTL among agents (default_ttl for agents without their own)."""
+    agent_ttls = AGENT_TTLS if agent_ttls is None else agent_ttls
+    return min((agent_ttls.get(agent, default_ttl) for agent in agents), default=default_ttl)
+
+
+class MemoryBackend:
+    """In-process LRU of (expires, chunks) by key."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, chunks, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, chunks)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Cache table in a SQLite file, shared between processes; LRU by last use."""
+
+    def __init__(self, path=".query_cache.sqlite", max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, chunks TEXT NOT NULL, expires REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT chunks, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, chunks, ttl):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, chunks, expires, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(chunks, default=str), now + ttl, now),
+            )
+            self._db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """Keyed, TTL-bounded store of response chunks for one project and config."""
+
+    def __init__(self, backend, project, config_path, agent_ttls=None, default_ttl=DEFAULT_TTL):
+        self.backend = backend
+        self.project = project
+        with open(config_path, "rb") as f:
+            self.config_hash = hashlib.sha256(f.read()).hexdigest()
+        self.agent_ttls = AGENT_TTLS if agent_ttls is None else agent_ttls
+        self.default_ttl = default_ttl
+        # Used when the chunks do not say which agent answered
+        self.fallback_ttl = agent_ttl(config_agents(config_path), self.agent_ttls, default_ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, query, **kwargs):
+        extra = json.dumps(kwargs, sort_keys=True, default=str)
+        raw = "\0".join([self.project, self.config_hash, normalize_query(query), extra])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, chunks):
+        agents = {chunk.get("role") for chunk in chunks if isinstance(chunk, dict) and chunk.get("role")}
+        if not agents:
+            return self.fallback_ttl
+        return agent_ttl(agents, self.agent_ttls, self.default_ttl)
+
+    def wrap(self, dc):
+        return CachedSession(dc, self)
+
+
+class CachedSession:
+    """Distiller session whose query() is served from a ResponseCache when possible."""
+
+    def __init__(self, dc, cache):
+        self._dc = dc
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._dc, name)
+
+    async def query(self, query, **kwargs):
+        key = self._cache.key(query, **kwargs)
+        try:
+            chunks = self._cache.backend.get(key)
+        except Exception as e:
+            # An unreadable cache (e.g. a locked SQLite file) is a miss, not a failed query
+            logger.warning("Cache lookup failed: %s: %s", type(e).__name__, e)
+            chunks = None
+        if chunks is not None:
+            self._cache.hits += 1
+            return _replay(chunks)
+        self._cache.misses += 1
+        return self._record(key, await self._dc.query(query=query, **kwargs))
+
+    async def _record(self, key, responses):
+        chunks = []
+        async for r in responses:
+            chunks.append(r)
+            yield r
+        # Only complete responses are cached; a failed write must not fail the query
+        try:
+            ttl = self._cache.ttl_for(chunks)
+            if chunks and ttl > 0:
+                self._cache.backend.set(key, chunks, ttl)
+        except Exception as e:
+            logger.warning("Not caching response: %s: %s", type(e).__name__, e)
+
+
+async def _replay(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def open_cache(kind, project, config_path, path=None):
+    """ResponseCache with a 'memory' or 'sqlite' backend, or None for 'off'."""
+    if kind in (None, "", "off"):
+        return None
+    if kind == "memory":
+        backend = MemoryBackend()
+    elif kind == "sqlite":
+        backend = SQLiteBackend(path or ".query_cache.sqlite")
+    else:
+        raise ValueError(f"Unknown cache backend '{kind}' (use off, memory or sqlite)")
+    return ResponseCache(backend, project, config_path)
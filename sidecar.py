@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Columnar sidecar files for Excel workbooks
+
+Opt-in (EXCEL_SIDECARS=1). The first read of a sheet parses it with openpyxl
+and writes it to a columnar sidecar. Later reads load only the needed columns
+from the sidecar. Sidecars are keyed by the SHA-256 of the workbook contents,
+so an edited workbook never reads stale data. Arrow IPC files are memory-mapped
+when pyarrow is installed. Otherwise each column gets its own NumPy file.
+
+Usage:
+    python sidecar.py convert data/*.xlsx
+    python sidecar.py status
+    python sidecar.py cleanup [--all]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+SIDECARS_ENABLED = os.getenv("EXCEL_SIDECARS", "0").lower() in ("1", "true", "yes")
+SIDECAR_DIR = Path(os.getenv("EXCEL_SIDECAR_DIR", Path(__file__).with_name(".excel_sidecars")))
+
+# Bump when the on-disk layout changes
+SIDECAR_VERSION = 1
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _write_file(path, write):
+    """Write path through write(f) on a binary temporary file, then move it in place."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _read_json(path, default):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _normalize(df):
+    """Make a parsed sheet storable: string column names, mixed object columns as text."""
+    df = df.reset_index(drop=True)
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object and not series.dropna().map(type).eq(str).all():
+            df[col] = series.where(series.isna(), series.astype(str))
+    return df
+
+
+def _is_array_column(series):
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufmM'
+
+
+class SidecarStore:
+    """Sidecar directory: one subdirectory per workbook content hash."""
+
+    def __init__(self, root=SIDECAR_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # Per-(content hash, sheet) locks held while a sheet is being converted
+        self._converting = {}
+
+    # ---- source hashing and staleness ----
+
+    def _index_path(self):
+        return self.root / 'index.json'
+
+    def source_hash(self, file_path):
+        """Content hash of a workbook; only re-hashed when its mtime or size changes."""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with self._lock:
+            index = _read_json(self._index_path(), {})
+            known = index.get(path)
+            if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+                return known['sha256']
+
+        sha = file_sha256(path)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            index = _read_json(self._index_path(), {})
+            index[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha}
+            _write_json(self._index_path(), index)
+        return sha
+
+    def _workbook_dir(self, sha):
+        return self.root / sha[:32]
+
+    def _manifest(self, sha, file_path):
+        manifest = _read_json(self._workbook_dir(sha) / 'manifest.json', None)
+        if manifest is None or manifest.get('version') != SIDECAR_VERSION:
+            manifest = {'version': SIDECAR_VERSION, 'sha256': sha, 'source': os.path.abspath(file_path),
+                        'sheet_names': None, 'sheets': {}}
+        return manifest
+
+    def _save_manifest(self, sha, manifest):
+        directory = self._workbook_dir(sha)
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_json(directory / 'manifest.json', manifest)
+
+    # ---- public API ----
+
+    def sheet_names(self, file_path):
+        sha = self.source_hash(file_path)
+        manifest = self._manifest(sha, file_path)
+        if manifest['sheet_names'] is None:
+            with pd.ExcelFile(file_path) as excel_file:
+                manifest['sheet_names'] = excel_file.sheet_names
+            with self._lock:
+                self._save_manifest(sha, manifest)
+        return manifest['sheet_names']
+
+    def columns(self, file_path, sheet_name=None):
+        """Return (sheet_name, columns), converting the sheet on first use."""
+        sha = self.source_hash(file_path)
+        sheet_name = sheet_name or self.sheet_names(file_path)[0]
+        info, _ = self._ensure(file_path, sha, sheet_name)
+        return sheet_name, info['columns']
+
+    def load(self, file_path, sheet_name=None, columns=None):
+        """Return (sheet_name, DataFrame) from the sidecar, converting on first use.
+
+        Only the given columns are read when columns is set.
+        """
+        sha = self.source_hash(file_path)
+        sheet_name = sheet_name or self.sheet_names(file_path)[0]
+        info, df = self._ensure(file_path, sha, sheet_name)
+        if df is not None:
+            return sheet_name, (df[columns] if columns is not None else df)
+
+        location = self._workbook_dir(sha) / info['file']
+        if info['format'] == 'arrow':
+            df = feather.read_table(location, columns=columns, memory_map=True).to_pandas()
+            # Arrow returns None for missing text; pandas.read_excel gives NaN
+            for col in df.columns[df.dtypes == object]:
+                df[col] = df[col].where(df[col].notna(), np.nan)
+            return sheet_name, df
+        return sheet_name, self._load_numpy(location, info, columns)
+
+    def _ensure(self, file_path, sha, sheet_name):
+        """Return (manifest entry, DataFrame or None) of a sheet, converting it first if needed.
+
+        The first request for a sheet converts it; concurrent ones wait and then
+        read its sidecar. The DataFrame is set when this call converted the sheet.
+        """
+        info = self._manifest(sha, file_path)['sheets'].get(sheet_name)
+        if self._usable(info):
+            return info, None
+        key = (sha, sheet_name)
+        with self._lock:
+            lock = self._converting.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                info = self._manifest(sha, file_path)['sheets'].get(sheet_name)
+                if self._usable(info):
+                    return info, None
+                df = self.convert(file_path, sheet_name)
+                return self._manifest(sha, file_path)['sheets'][sheet_name], df
+            finally:
+                with self._lock:
+                    self._converting.pop(key, None)
+
+    @staticmethod
+    def _usable(info):
+        # Arrow sidecars written elsewhere cannot be read without pyarrow
+        return info is not None and not (info['format'] == 'arrow' and feather is None)
+
+    def convert(self, file_path, sheet_name=None):
+        """Parse one sheet with openpyxl and write its sidecar; returns the parsed DataFrame."""
+        sha = self.source_hash(file_path)
+        with pd.ExcelFile(file_path) as excel_file:
+            sheet_names = excel_file.sheet_names
+            sheet_name = sheet_name or sheet_names[0]
+            df = _normalize(excel_file.parse(sheet_name))
+
+        sheet_id = sheet_names.index(sheet_name)
+        directory = self._workbook_dir(sha)
+        directory.mkdir(parents=True, exist_ok=True)
+        if feather is not None:
+            info = {'format': 'arrow', 'file': f"sheet-{sheet_id}.arrow"}
+            _write_file(directory / info['file'], lambda f: feather.write_feather(df, f, compression='uncompressed'))
+        else:
+            info = {'format': 'numpy', 'file': f"sheet-{sheet_id}"}
+            info['kinds'] = self._save_numpy(directory / info['file'], df)
+        info.update({'columns': list(df.columns), 'rows': len(df)})
+
+        with self._lock:
+            manifest = self._manifest(sha, file_path)
+            manifest['sheet_names'] = sheet_names
+            manifest['sheets'][sheet_name] = info
+            self._save_manifest(sha, manifest)
+        return df
+
+    def convert_all(self, file_path):
+        """Convert every sheet of a workbook that has no sidecar yet."""
+        sha = self.source_hash(file_path)
+        converted = []
+        for sheet_name in self.sheet_names(file_path):
+            if self._ensure(file_path, sha, sheet_name)[1] is not None:
+                converted.append(sheet_name)
+        return converted
+
+    def status(self):
+        """Describe every sidecar: source, sheets, size on disk and whether it is stale."""
+        index = _read_json(self._index_path(), {})
+        live = self._live_hashes(index, rehash=False)
+        rows = []
+        for directory in sorted(p for p in self.root.glob('*') if p.is_dir()):
+            manifest = _read_json(directory / 'manifest.json', {})
+            size = sum(f.stat().st_size for f in directory.rglob('*') if f.is_file())
+            rows.append({
+                'source': manifest.get('source', '?'),
+                'sheets': len(manifest.get('sheets', {})),
+                'bytes': size,
+                'stale': directory.name not in live,
+            })
+        return rows
+
+    def cleanup(self, remove_all=False):
+        """Delete stale sidecars (source gone or changed), or every sidecar with remove_all.
+
+        Returns (directories removed, bytes freed).
+        """
+        with self._lock:
+            index = _read_json(self._index_path(), {})
+            live = set() if remove_all else self._live_hashes(index, rehash=True)
+            removed = 0
+            freed = 0
+            for directory in [p for p in self.root.glob('*') if p.is_dir()]:
+                if directory.name in live:
+                    continue
+                freed += sum(f.stat().st_size for f in directory.rglob('*') if f.is_file())
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+            index = {} if remove_all else {p: e for p, e in index.items() if e['sha256'][:32] in live}
+            if self.root.exists():
+                _write_json(self._index_path(), index)
+        return removed, freed
+
+    def _live_hashes(self, index, rehash):
+        """Sidecar directory names still matching an existing source file."""
+        live = set()
+        for path, entry in index.items():
+            if not os.path.exists(path):
+                continue
+            stat = os.stat(path)
+            unchanged = entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size
+            if unchanged or (rehash and file_sha256(path) == entry['sha256']):
+                live.add(entry['sha256'][:32])
+        return live
+
+    # ---- NumPy fallback (no pyarrow) ----
+
+    @staticmethod
+    def _save_numpy(directory, df):
+        """Numeric/bool/datetime columns as .npy (memory-mappable), text as UTF-8 blob + offsets.
+
+        Every file is written under a temporary name and moved in place, so a
+        concurrent reader never sees a partial file.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        kinds = []
+        for j, col in enumerate(df.columns):
+            series = df[col]
+            if _is_array_column(series):
+                values = series.to_numpy()
+                _write_file(directory / f"c{j}.npy", lambda f: np.save(f, values))
+                kinds.append('array')
+                continue
+            missing = series.isna().to_numpy()
+            encoded = [b'' if na else str(v).encode('utf-8', 'surrogatepass') for v, na in zip(series, missing)]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+            _write_file(directory / f"c{j}.txt", lambda f: f.write(b''.join(encoded)))
+            _write_file(directory / f"c{j}.off.npy", lambda f: np.save(f, offsets))
+            _write_file(directory / f"c{j}.na.npy", lambda f: np.save(f, missing))
+            kinds.append('text')
+        return kinds
+
+    @staticmethod
+    def _load_numpy(directory, info, columns):
+        data = {}
+        for j, col in enumerate(info['columns']):
+            if columns is not None and col not in columns:
+                continue
+            if info['kinds'][j] == 'array':
+                data[col] = np.load(directory / f"c{j}.npy", mmap_mode='r')
+                continue
+            blob = (directory / f"c{j}.txt").read_bytes()
+            offsets = np.load(directory / f"c{j}.off.npy").tolist()
+            missing = np.load(directory / f"c{j}.na.npy").tolist()
+            data[col] = pd.Series([
+                np.nan if na else blob[start:end].decode('utf-8', 'surrogatepass')
+                for start, end, na in zip(offsets, offsets[1:], missing)
+            ], dtype=object)
+        df = pd.DataFrame(data, columns=[c for c in info['columns'] if columns is None or c in columns])
+        return df[columns] if columns is not None else df
+
+
+sidecar_store = SidecarStore()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage columnar sidecars of Excel workbooks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="write sidecars for every sheet of the given workbooks")
+    convert.add_argument("files", nargs="+")
+    sub.add_parser("status", help="list sidecars and whether they are stale")
+    cleanup = sub.add_parser("cleanup", help="delete stale sidecars")
+    cleanup.add_argument("--all", action="store_true", help="delete every sidecar")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        for file_path in args.files:
+            sheets = sidecar_store.convert_all(file_path)
+            print(f"✅ {file_path}: {len(sheets)} sheet(s) converted")
+    elif args.command == "status":
+        for row in sidecar_store.status():
+            state = "stale" if row['stale'] else "fresh"
+            print(f"{state:<6} {row['bytes'] / 1024 / 1024:>8.1f} MB  {row['sheets']} sheet(s)  {row['source']}")
+    else:
+        removed, freed = sidecar_store.cleanup(remove_all=args.all)
+        print(f"🧹 Removed {removed} sidecar(s), freed {freed / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Streaming latency instrumentation for Distiller queries
+
+Records connect time, time to first chunk, the gap before each further chunk
+and total duration of every query, and aggregates them into p50/p95/p99
+summaries that can be dumped as JSON or Prometheus text format.
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRICS = {
+    'connect_seconds': "Time to open a Distiller session",
+    'ttfc_seconds': "Time from sending a query to its first response chunk",
+    'chunk_gap_seconds': "Time between consecutive response chunks",
+    'total_seconds': "Time from sending a query to its last response chunk",
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LatencySamples:
+    """Samples of one metric, with count, sum and quantiles."""
+
+    def __init__(self):
+        self.values = []
+
+    def add(self, seconds):
+        self.values.append(seconds)
+
+    def summary(self):
+        values = sorted(self.values)
+        summary = {'count': len(values), 'sum': round(sum(values), 6)}
+        for q in QUANTILES:
+            value = percentile(values, q * 100)
+            summary[f"p{q * 100:g}"] = round(value, 6) if value is not None else None
+        summary['max'] = round(values[-1], 6) if values else None
+        return summary
+
+
+class StreamMetrics:
+    """Latency samples and per-query records of one process."""
+
+    def __init__(self, max_records=1000):
+        self.samples = {name: LatencySamples() for name in METRICS}
+        self.queries = {'ok': 0, 'error': 0}
+        self.chunks = 0
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def _add(self, name, seconds):
+        with self._lock:
+            self.samples[name].add(seconds)
+
+    def session(self, context):
+        """Wrap an unopened session context (client(project=..., uuid=...)) to time connecting."""
+        return _TimedSession(context, self)
+
+    def wrap(self, dc):
+        return InstrumentedSession(dc, self)
+
+    async def instrument(self, query, responses, start):
+        """Yield the chunks of responses while timing them from start (perf_counter)."""
+        record = {'query': query, 'chunks': 0, 'status': 'error'}
+        last = None
+        try:
+            async for r in responses:
+                now = time.perf_counter()
+                if last is None:
+                    record['ttfc_s'] = round(now - start, 6)
+                    self._add('ttfc_seconds', now - start)
+                else:
+                    self._add('chunk_gap_seconds', now - last)
+                last = now
+                record['chunks'] += 1
+                yield r
+            record['status'] = 'ok'
+        finally:
+            self._finish(record, start)
+
+    def _finish(self, record, start):
+        total = time.perf_counter() - start
+        record['total_s'] = round(total, 6)
+        with self._lock:
+            if record['status'] == 'ok':
+                self.samples['total_seconds'].add(total)
+            self.queries[record['status']] += 1
+            self.chunks += record['chunks']
+            self.records.append(record)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'queries': dict(self.queries),
+                'chunks': self.chunks,
+                **{name: samples.summary() for name, samples in self.samples.items()},
+                'records': list(self.records),
+            }
+
+    def to_prometheus(self, prefix="distiller_query"):
+        """Prometheus text exposition: one summary per metric plus query and chunk counters."""
+        data = self.to_dict()
+        lines = [
+            f"# HELP {prefix}_total Queries by outcome",
+            f"# TYPE {prefix}_total counter",
+        ]
+        lines += [f'{prefix}_total{{status="{status}"}} {count}' for status, count in data['queries'].items()]
+        lines += [
+            f"# HELP {prefix}_chunks_total Response chunks received",
+            f"# TYPE {prefix}_chunks_total counter",
+            f"{prefix}_chunks_total {data['chunks']}",
+        ]
+        for name, help_text in METRICS.items():
+            summary = data[name]
+            metric = f"{prefix}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            for q in QUANTILES:
+                value = summary[f"p{q * 100:g}"]
+                lines.append(f'{metric}{{quantile="{q:g}"}} {value if value is not None else "NaN"}')
+            lines += [f"{metric}_sum {summary['sum']}", f"{metric}_count {summary['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path, fmt="json"):
+        """Write the metrics to path as 'json' or 'prometheus' text."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == "prometheus":
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2, default=str)
+
+
+class _TimedSession:
+    def __init__(self, context, metrics):
+        self._context = context
+        self._metrics = metrics
+
+    async def __aenter__(self):
+        start = time.perf_counter()
+        dc = await self._context.__aenter__()
+        self._metrics._add('connect_seconds', time.perf_counter() - start)
+        return dc
+
+    async def __aexit__(self, *exc):
+        return await self._context.__aexit__(*exc)
+
+
+class InstrumentedSession:
+    """Distiller session whose query() streams are timed by a StreamMetrics."""
+
+    def __init__(self, dc, metrics):
+        self._dc = dc
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._dc, name)
+
+    async def query(self, query, **kwargs):
+        start = time.perf_counter()
+        try:
+            responses = await self._dc.query(query=query, **kwargs)
+        except Exception:
+            self._metrics._finish({'query': query, 'chunks': 0, 'status': 'error'}, start)
+            raise
+        return self._metrics.instrument(query, responses, start)
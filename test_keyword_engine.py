@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Parity of the batched keyword counters with the original join/findall tokenizer
+"""
+
+import re
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from keyword_engine import count_keywords, count_keywords_stream
+
+# Stop words of the original analyze_ecommerce_keywords.py
+COMMON_WORDS = {'the', 'and', 'or', 'a', 'an', 'in', 'is', 'has', 'with', 'for', 'to', 'of', 'at', 'by', 'from', 'on', 'that', 'this', 'as', 'be', 'are', 'was', 'were', 'been', 'being', 'have', 'should', 'must', 'can', 'will', 'may', 'could', 'would', 'it', 'its', 'if', 'exists', 'exist', 'under', 'also', 'only', 'not', 'just', 'some', 'more', 'no', 'up', 'out', 'so', 'do', 'does', 'did', 'then', 'there', 'here', 'each', 'all', 'which', 'when', 'what', 'where', 'who', 'why', 'how'}
+
+TEXTS = [
+    "User must be logged in with a valid email/password.",
+    "Cart has 3 items; product_id=42 exists in the catalog!",
+    "Go to /checkout -> pay via UPI, card or COD (cash-on-delivery).",
+    float('nan'),
+    "Order #1001 status: SHIPPED... then DELIVERED",
+    12345,
+    "an a is ok to go up by me",
+    "Refund & return: item2 x3 re-stocked",
+    None,
+    "The the THE and AND",
+    "Café crème — naïve résumé",
+    "",
+]
+
+
+def reference_counts(values):
+    """The original implementation: one joined string, one findall, then filtering."""
+    all_text = ' '.join([str(v) for v in values])
+    words = re.findall(r'\b[a-zA-Z_]+\b', all_text.lower())
+    word_freq = Counter([w for w in words if len(w) > 2 and w not in COMMON_WORDS])
+    return word_freq, len(words)
+
+
+@pytest.fixture
+def text_data():
+    return pd.Series(TEXTS, dtype=object).dropna()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 50_000])
+def test_count_keywords_matches_reference(text_data, chunk_size):
+    expected_freq, expected_total = reference_counts(text_data)
+    word_freq, total_words = count_keywords(text_data, COMMON_WORDS, chunk_size=chunk_size)
+    assert word_freq == expected_freq
+    assert list(word_freq) == list(expected_freq)
+    assert total_words == expected_total
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 50_000])
+def test_count_keywords_stream_matches_reference(text_data, chunk_size):
+    expected_freq, expected_total = reference_counts(text_data)
+    word_freq, total_words, records = count_keywords_stream(iter(text_data), COMMON_WORDS, chunk_size=chunk_size)
+    assert word_freq == expected_freq
+    assert list(word_freq) == list(expected_freq)
+    assert total_words == expected_total
+    assert records == len(text_data)
+
+
+def test_filters_short_words_and_stop_words(text_data):
+    word_freq, _ = count_keywords(text_data, COMMON_WORDS)
+    assert not any(len(word) <= 2 for word in word_freq)
+    assert not COMMON_WORDS & word_freq.keys()
+    assert word_freq['the'] == 0 and word_freq['product_id'] == 1 and word_freq['item'] == 0
+
+
+def test_empty_column():
+    assert count_keywords(pd.Series([], dtype=object), COMMON_WORDS) == (Counter(), 0)
+    assert count_keywords_stream([], COMMON_WORDS) == (Counter(), 0, 0)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Local MCP time server (SSE) standing in for the Time Server Agent's endpoint
+
+Serves get_current_time and convert_time at http://localhost:8091/sse, the
+mcp_sse_url in configWeather.yaml, with optional artificial latency and
+error injection for offline tuning of wait_time and concurrency.
+
+Usage:
+    python time_server.py
+    python time_server.py --latency-ms 300 --jitter-ms 100 --error-rate 0.05 --hang-rate 0.01
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from mcp.server.fastmcp import FastMCP
+
+# Fault injection settings, replaced from the command line in main()
+settings = {
+    'latency_ms': 0.0,     # added to every call
+    'jitter_ms': 0.0,      # uniform +/- around latency_ms
+    'error_rate': 0.0,     # share of calls that fail with an error
+    'hang_rate': 0.0,      # share of calls that never answer within hang_seconds
+    'hang_seconds': 600.0,
+}
+
+mcp = FastMCP("time", host="127.0.0.1", port=8091)
+
+
+async def _inject_faults():
+    delay = settings['latency_ms'] + random.uniform(-settings['jitter_ms'], settings['jitter_ms'])
+    roll = random.random()
+    if roll < settings['hang_rate']:
+        await asyncio.sleep(settings['hang_seconds'])
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if roll < settings['hang_rate'] + settings['error_rate']:
+        raise RuntimeError("Injected server error")
+
+
+def _zone(name):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{name}'. Use an IANA name such as 'Asia/Kolkata'.")
+
+
+def _describe(moment):
+    return {
+        'timezone': str(moment.tzinfo),
+        'datetime': moment.isoformat(timespec='seconds'),
+        'utc_offset': moment.strftime('%z'),
+        'is_dst': bool(moment.dst()),
+    }
+
+
+@mcp.tool()
+async def get_current_time(timezone: str) -> dict:
+    """Get the current time in an IANA timezone (e.g. 'Asia/Kolkata', 'America/New_York')."""
+    await _inject_faults()
+    return _describe(datetime.now(_zone(timezone)))
+
+
+@mcp.tool()
+async def convert_time(source_timezone: str, time: str, target_timezone: str) -> dict:
+    """Convert a time of day (HH:MM, 24-hour) today from one IANA timezone to another."""
+    await _inject_faults()
+    hour, minute = (int(part) for part in time.split(':'))
+    source = datetime.now(_zone(source_timezone)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+    target = source.astimezone(_zone(target_timezone))
+    offset = (target.utcoffset() - source.utcoffset()).total_seconds() / 3600
+    return {'source': _describe(source), 'target': _describe(target), 'time_difference': f"{offset:+g}h"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SSE MCP time server with fault injection")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8091, help="port (default: 8091, as in configWeather.yaml)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="artificial latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform jitter around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls that return an error (0-1)")
+    parser.add_argument("--hang-rate", type=float, default=0.0,
+                        help="share of calls that do not answer for --hang-seconds (0-1)")
+    parser.add_argument("--hang-seconds", type=float, default=600.0, help="how long a hanging call waits")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible fault injection")
+    args = parser.parse_args()
+
+    settings.update(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                    hang_rate=args.hang_rate, hang_seconds=args.hang_seconds)
+    if args.seed is not None:
+        random.seed(args.seed)
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+
+    print(f"🕒 MCP time server on http://{args.host}:{args.port}/sse")
+    print(f"   latency {args.latency_ms:g}±{args.jitter_ms:g} ms, error rate {args.error_rate:g}, "
+          f"hang rate {args.hang_rate:g} ({args.hang_seconds:g}s)")
+    mcp.run(transport="sse")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Load harness for an SSE MCP time server (see time_server.py)
+
+Calls a tool at a fixed concurrency and reports throughput, latency
+percentiles, error and timeout rates, to tune the Time Server Agent's
+wait_time and concurrency offline.
+
+Usage:
+    python time_server_load.py --concurrency 20 --requests 1000 --timeout 5
+    python time_server_load.py --url http://localhost:8091/sse --connect-per-call --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from contextlib import AsyncExitStack
+from itertools import islice
+
+import anyio
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from stream_metrics import percentile
+
+TIMEZONES = ['Asia/Kolkata', 'America/New_York', 'Europe/London', 'Asia/Tokyo', 'Australia/Sydney']
+
+
+def _arguments(tool, i):
+    timezone = TIMEZONES[i % len(TIMEZONES)]
+    if tool == 'convert_time':
+        return {'source_timezone': 'UTC', 'time': '12:00', 'target_timezone': timezone}
+    return {'timezone': timezone}
+
+
+async def _call(session, tool, i, timeout):
+    arguments = _arguments(tool, i)
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(session.call_tool(tool, arguments), timeout)
+        status = 'error' if result.isError else 'ok'
+    except asyncio.TimeoutError:
+        status = 'timeout'
+    except Exception:
+        status = 'error'
+    return status, time.perf_counter() - start
+
+
+async def _open_session(stack, url):
+    read, write = await stack.enter_async_context(sse_client(url))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+async def _connect_and_call(url, tool, i, timeout):
+    """Open a session, call the tool once and close it, all within timeout."""
+    start = time.perf_counter()
+    try:
+        # The SSE client's task group must be entered and left in this task, so no wait_for here
+        with anyio.fail_after(timeout):
+            async with AsyncExitStack() as stack:
+                session = await _open_session(stack, url)
+                result = await session.call_tool(tool, _arguments(tool, i))
+        status = 'error' if result.isError else 'ok'
+    except TimeoutError:
+        status = 'timeout'
+    except Exception:
+        status = 'error'
+    return status, time.perf_counter() - start
+
+
+async def run_load(url, concurrency=10, requests=200, timeout=260.0, tool='get_current_time',
+                   connect_per_call=False):
+    """Issue requests tool calls with concurrency workers; returns the report dict.
+
+    Each worker keeps one session unless connect_per_call is set, in which case
+    every call opens (and times) its own connection, like a fresh agent would.
+    A timed-out call counts towards the timeout rate, not the latency percentiles.
+    A worker that cannot open its session within timeout records its share of
+    the calls as errors or timeouts, so the report is still produced.
+    """
+    next_index = iter(range(requests))
+    share = -(-requests // max(concurrency, 1))
+    outcomes = []
+
+    async def worker():
+        if connect_per_call:
+            for i in next_index:
+                outcomes.append(await _connect_and_call(url, tool, i, timeout))
+            return
+
+        start = time.perf_counter()
+        session = None
+        status = 'timeout'
+        try:
+            # The SSE client's task group must nest inside the cancel scope, so the scope spans the
+            # session's whole life; its deadline only bounds connecting
+            with anyio.CancelScope(deadline=anyio.current_time() + timeout) as scope:
+                async with AsyncExitStack() as stack:
+                    session = await _open_session(stack, url)
+                    scope.deadline = math.inf
+                    for i in next_index:
+                        outcomes.append(await _call(session, tool, i, timeout))
+        except Exception:
+            if session is not None:
+                raise
+            status = 'error'
+        if session is None:
+            failed = time.perf_counter() - start
+            outcomes.extend((status, failed) for _ in islice(next_index, share))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for status, latency in outcomes if status == 'ok')
+    counts = {status: sum(1 for s, _ in outcomes if s == status) for status in ('ok', 'error', 'timeout')}
+    total = len(outcomes) or 1
+    return {
+        'url': url,
+        'tool': tool,
+        'concurrency': concurrency,
+        'requests': len(outcomes),
+        'timeout_s': timeout,
+        'connect_per_call': connect_per_call,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(outcomes) / elapsed, 2) if elapsed else None,
+        'ok': counts['ok'],
+        'errors': counts['error'],
+        'timeouts': counts['timeout'],
+        'error_rate': round(counts['error'] / total, 4),
+        'timeout_rate': round(counts['timeout'] / total, 4),
+        'latency_ms': {
+            name: round(value * 1000, 2) if value is not None else None
+            for name, value in (
+                ('min', latencies[0] if latencies else None),
+                ('p50', percentile(latencies, 50)),
+                ('p90', percentile(latencies, 90)),
+                ('p95', percentile(latencies, 95)),
+                ('p99', percentile(latencies, 99)),
+                ('max', latencies[-1] if latencies else None),
+            )
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test an SSE MCP time server")
+    parser.add_argument("--url", default="http://localhost:8091/sse", help="SSE endpoint (default: configWeather.yaml's)")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="concurrent callers (default: 10)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="total tool calls (default: 200)")
+    parser.add_argument("--timeout", type=float, default=260.0,
+                        help="per-call timeout in seconds, like wait_time (default: 260)")
+    parser.add_argument("--tool", default="get_current_time", help="get_current_time or convert_time (default: get_current_time)")
+    parser.add_argument("--connect-per-call", action="store_true", help="open a new SSE session for every call")
+    parser.add_argument("--json", metavar="PATH", help="also write the report to a JSON file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.url, args.concurrency, args.requests, args.timeout, args.tool,
+                                  args.connect_per_call))
+
+    print("=" * 80)
+    print(f"MCP LOAD TEST - {args.url} ({args.tool})")
+    print("=" * 80)
+    print(f"📊 Requests: {report['requests']} at concurrency {report['concurrency']} "
+          f"in {report['elapsed_s']:.1f}s ({report['throughput_rps']} req/s)")
+    print(f"✅ OK: {report['ok']}   ❌ Errors: {report['errors']} ({report['error_rate']:.1%})   "
+          f"⏱️  Timeouts: {report['timeouts']} ({report['timeout_rate']:.1%})")
+    print("⏱️  Latency (ms): " + ", ".join(f"{k} {v}" for k, v in report['latency_ms'].items()))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Shared in-process LRU cache of parsed Excel workbooks
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import sidecar
+from excel_stream import find_column
+from keyword_index import combine_indexes, index_series
+
+# Cache limits (override through the environment)
+MAX_WORKBOOKS = int(os.getenv("WORKBOOK_CACHE_MAX_FILES", "16"))
+MEMORY_BUDGET_MB = int(os.getenv("WORKBOOK_CACHE_MAX_MB", "1024"))
+
+
+class CachedWorkbook:
+    """Parsed sheets of one version (path, mtime, size) of a workbook."""
+
+    def __init__(self, path, sheet_names):
+        self.path = path
+        self.sheet_names = list(sheet_names)
+        self.frames = {}
+        # KeywordIndex by (sheet, column or tuple of columns, taxonomy version)
+        self.indexes = {}
+        self.nbytes = 0
+        self.lock = threading.Lock()
+
+    def resolve_sheet(self, sheet_name=None):
+        """Return the requested sheet name, defaulting to the first sheet."""
+        if sheet_name is None or sheet_name == "":
+            return self.sheet_names[0]
+        if sheet_name not in self.sheet_names:
+            raise KeyError(f"Sheet '{sheet_name}' not found. Available sheets: {', '.join(self.sheet_names)}")
+        return sheet_name
+
+
+class WorkbookCache:
+    """LRU cache of parsed workbooks keyed by path, mtime and size."""
+
+    def __init__(self, max_workbooks=MAX_WORKBOOKS, memory_budget_mb=MEMORY_BUDGET_MB):
+        self.max_workbooks = max_workbooks
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-version locks held while a cold workbook is being parsed
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(file_path):
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key, entry):
+        with self._lock:
+            # Drop entries for older versions of the same file
+            for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+                del self._entries[stale]
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            self._evict()
+            return entry
+
+    def get_workbook(self, file_path):
+        """Return the cache entry for the current on-disk version of a workbook."""
+        key = self._key(file_path)
+        entry = self._lookup(key)
+        if entry is None:
+            if sidecar.SIDECARS_ENABLED:
+                entry = self._store(key, CachedWorkbook(key[0], sidecar.sidecar_store.sheet_names(key[0])))
+            else:
+                with pd.ExcelFile(key[0]) as excel_file:
+                    entry = self._store(key, CachedWorkbook(key[0], excel_file.sheet_names))
+        return entry
+
+    def read_sheet(self, file_path, sheet_name=None):
+        """Return (sheet_name, DataFrame), parsing the sheet at most once per file version.
+
+        The returned DataFrame is shared between callers and must not be modified in place.
+        """
+        key = self._key(file_path)
+        entry = self._lookup(key)
+        if entry is None and not sidecar.SIDECARS_ENABLED:
+            # The first request for a version parses it; concurrent ones wait and share its result
+            with self._loading_lock(key):
+                try:
+                    entry = self._lookup(key)
+                    if entry is None:
+                        return self._load_sheet(key, sheet_name)
+                finally:
+                    with self._lock:
+                        self._loading.pop(key, None)
+
+        entry = entry or self.get_workbook(file_path)
+        sheet_name = entry.resolve_sheet(sheet_name)
+        with entry.lock:
+            df = entry.frames.get(sheet_name)
+            if df is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                df = self._add_frame(entry, sheet_name, self._parse(entry.path, sheet_name))
+
+        with self._lock:
+            self._evict()
+        return sheet_name, df
+
+    def _load_sheet(self, key, sheet_name):
+        # Parse the requested sheet while the workbook is already open
+        with pd.ExcelFile(key[0]) as excel_file:
+            entry = CachedWorkbook(key[0], excel_file.sheet_names)
+            sheet_name = entry.resolve_sheet(sheet_name)
+            self.misses += 1
+            df = self._add_frame(entry, sheet_name, excel_file.parse(sheet_name))
+        stored = self._store(key, entry)
+        if stored is not entry:
+            # Another request cached this version first; keep its entry
+            with stored.lock:
+                if sheet_name not in stored.frames:
+                    self._add_frame(stored, sheet_name, df)
+                df = stored.frames[sheet_name]
+        return sheet_name, df
+
+    def _loading_lock(self, key):
+        with self._lock:
+            return self._loading.setdefault(key, threading.Lock())
+
+    def read_column(self, file_path, column_name, sheet_name=None):
+        """Return (sheet_name, columns, column, Series) for one column (case-insensitive).
+
+        column and Series are None when the column does not exist. With sidecars
+        enabled and the sheet not cached, only that column is loaded.
+        """
+        if sidecar.SIDECARS_ENABLED:
+            entry = self.get_workbook(file_path)
+            sheet_name = entry.resolve_sheet(sheet_name)
+            if sheet_name not in entry.frames:
+                sheet_name, columns = sidecar.sidecar_store.columns(entry.path, sheet_name)
+                column = find_column(columns, column_name)
+                if column is None:
+                    return sheet_name, columns, None, None
+                _, df = sidecar.sidecar_store.load(entry.path, sheet_name, [column])
+                return sheet_name, columns, column, df[column]
+
+        sheet_name, df = self.read_sheet(file_path, sheet_name)
+        column = find_column(df.columns, column_name)
+        return sheet_name, list(df.columns), column, (df[column] if column is not None else None)
+
+    def keyword_index(self, file_path, column_name, taxonomy, sheet_name=None):
+        """Return (sheet_name, column, KeywordIndex) for one column (case-insensitive).
+
+        The index is built on first use and kept with this version of the
+        workbook, counting towards the memory budget. column_name may also be
+        a list of columns, giving a combined index labelled 'A + B'.
+        """
+        if not isinstance(column_name, str):
+            parts = [self.keyword_index(file_path, name, taxonomy, sheet_name) for name in column_name]
+            sheet_name = parts[0][0]
+            columns = tuple(dict.fromkeys(column for _, column, _ in parts))
+            if len(columns) == 1:
+                return parts[0]
+            return sheet_name, ' + '.join(columns), self._cached_index(
+                file_path, (sheet_name, columns, taxonomy.version),
+                lambda: combine_indexes([index for _, _, index in parts]),
+            )
+
+        sheet_name, columns, column, series = self.read_column(file_path, column_name, sheet_name)
+        if column is None:
+            raise KeyError(f"Column '{column_name}' not found. Available columns: {', '.join(map(str, columns))}")
+        return sheet_name, column, self._cached_index(
+            file_path, (sheet_name, column, taxonomy.version), lambda: index_series(series, taxonomy.stop_words)
+        )
+
+    def _cached_index(self, file_path, key, build):
+        entry = self.get_workbook(file_path)
+        with entry.lock:
+            index = entry.indexes.get(key)
+            if index is None:
+                index = entry.indexes[key] = build()
+                entry.nbytes += index.nbytes
+        with self._lock:
+            self._evict()
+        return index
+
+    def read_page(self, file_path, page=1, page_size=10, columns=None, sheet_name=None):
+        """Return (sheet_name, all_columns, total_rows, page, DataFrame) for one page of rows.
+
+        columns selects a subset (case-insensitive); page is clamped to the last page.
+        """
+        sheet_name, df = self.read_sheet(file_path, sheet_name)
+        selected = self._select(df, columns)
+        page_size = max(int(page_size), 1)
+        pages = max((len(df) + page_size - 1) // page_size, 1)
+        page = min(max(int(page), 1), pages)
+        start = (page - 1) * page_size
+        return sheet_name, list(df.columns), len(df), page, df.iloc[start:start + page_size][selected]
+
+    def export_csv(self, file_path, dest, columns=None, sheet_name=None, chunk_rows=10_000):
+        """Write a sheet (or selected columns) to dest as CSV, chunk_rows rows at a time."""
+        sheet_name, df = self.read_sheet(file_path, sheet_name)
+        selected = self._select(df, columns)
+        with open(dest, 'w', encoding='utf-8', newline='') as f:
+            for start in range(0, max(len(df), 1), chunk_rows):
+                df.iloc[start:start + chunk_rows][selected].to_csv(f, index=False, header=(start == 0))
+        return dest
+
+    @staticmethod
+    def _select(df, columns):
+        if not columns:
+            return list(df.columns)
+        selected = []
+        for name in columns:
+            column = find_column(df.columns, name)
+            if column is None:
+                raise KeyError(f"Column '{name}' not found. Available columns: {', '.join(df.columns)}")
+            selected.append(column)
+        return selected
+
+    @staticmethod
+    def _parse(path, sheet_name):
+        if sidecar.SIDECARS_ENABLED:
+            return sidecar.sidecar_store.load(path, sheet_name)[1]
+        return pd.read_excel(path, sheet_name=sheet_name)
+
+    @staticmethod
+    def _add_frame(entry, sheet_name, df):
+        entry.frames[sheet_name] = df
+        entry.nbytes += int(df.memory_usage(index=True, deep=True).sum())
+        return df
+
+    def invalidate(self, file_path=None):
+        """Forget one workbook (all versions) or, with no argument, everything."""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(file_path)
+            for key in [k for k in self._entries if k[0] == path]:
+                del self._entries[key]
+
+    def total_bytes(self):
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def _evict(self):
+        # Always keep the most recently used workbook, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_workbooks or self.total_bytes() > self.memory_budget
+        ):
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workbooks': len(self._entries),
+                'bytes': self.total_bytes(),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# Process-wide cache shared by the Gradio handlers
+workbook_cache = WorkbookCache()
+
+
+def read_sheet(file_path, sheet_name=None):
+    """Read a sheet through the shared workbook cache."""
+    return workbook_cache.read_sheet(file_path, sheet_name)
+
+
+def read_column(file_path, column_name, sheet_name=None):
+    """Read one column through the shared workbook cache (see WorkbookCache.read_column)."""
+    return workbook_cache.read_column(file_path, column_name, sheet_name)
+
+
+def keyword_index(file_path, column_name, taxonomy, sheet_name=None):
+    """Keyword -> row index of one column through the shared workbook cache (see WorkbookCache.keyword_index)."""
+    return workbook_cache.keyword_index(file_path, column_name, taxonomy, sheet_name)
+
+
+def read_page(file_path, page=1, page_size=10, columns=None, sheet_name=None):
+    """Read one page of rows through the shared workbook cache (see WorkbookCache.read_page)."""
+    return workbook_cache.read_page(file_path, page, page_size, columns, sheet_name)
+
+
+def export_csv(file_path, dest, columns=None, sheet_name=None):
+    """Export a cached sheet to a CSV file in chunks (see WorkbookCache.export_csv)."""
+    return workbook_cache.export_csv(file_path, dest, columns, sheet_name)